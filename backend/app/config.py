@@ -1,4 +1,5 @@
 import os
+from typing import List
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -14,6 +15,36 @@ class Settings(BaseSettings):
     TWITTER_BEARER_TOKEN: str = os.getenv("TWITTER_BEARER_TOKEN", "")
     TWITTER_ACCESS_TOKEN: str = os.getenv("TWITTER_ACCESS_TOKEN", "")
     TWITTER_ACCESS_SECRET: str = os.getenv("TWITTER_ACCESS_SECRET", "")
+    TWITTER_API_BASE_URL: str = os.getenv("TWITTER_API_BASE_URL", "https://api.twitter.com")
+
+    # Twitter rate limiting (recent search, app-only auth: 450 requests / 15 min)
+    TWITTER_SEARCH_RATE_LIMIT: int = 450
+    TWITTER_RATE_WINDOW_SECONDS: int = 900
+    TWITTER_MAX_RATE_WAIT_SECONDS: float = 30.0  # Longer waits fail fast with 429
+
+    # Background keyword tracking
+    TRACK_POLL_INTERVAL_SECONDS: float = 30.0
+    TRACK_BUFFER_SIZE: int = 1000  # Scored tweets kept per keyword
+    TRACK_MAX_PER_POLL: int = 100
+
+    # Live sentiment aggregation (dashboard sliding windows)
+    AGGREGATION_BUCKET_SECONDS: int = 5  # Time resolution of the 1m/5m/1h windows
+    AGGREGATION_MAX_SERIES: int = 256  # Keywords/countries/models tracked each, the rest counted as "Other"
+    AGGREGATION_TOP_TOKENS: int = 20
+    AGGREGATION_SKETCH_WIDTH: int = 2 ** 14  # Count-min sketch counters per row
+    AGGREGATION_SKETCH_DEPTH: int = 4
+
+    # Trained-vs-live drift monitoring
+    DRIFT_BUCKET_SECONDS: int = 10
+    DRIFT_REFERENCE_ROWS: int = 5000  # Held-out texts scored for the training-time snapshot
+    DRIFT_REFERENCE_TERMS: int = 200  # Most frequent training terms compared, the rest binned as "other"
+    DRIFT_MIN_ROWS: int = 50  # Live rows a window needs before drift is scored
+    DRIFT_PSI_MODERATE: float = 0.1
+    DRIFT_PSI_MAJOR: float = 0.25
+
+    # Scored live tweet storage (Parquet segments in LIVE_DATA_DIR)
+    LIVE_FLUSH_ROWS: int = 5000  # Buffered rows per hour/keyword partition before a segment is written
+    LIVE_FLUSH_SECONDS: float = 60.0  # Max age of buffered rows
     
     # Paths
     TRAINED_DATA_DIR: str = os.path.join("backend", "data", "trained")
@@ -21,6 +52,59 @@ class Settings(BaseSettings):
     PREVIOUS_DATA_DIR: str = os.path.join("backend", "data", "previous")
     MODEL_SAVE_DIR: str = os.path.join("backend", "saved_models")
 
+    # Training jobs
+    JOB_DB_PATH: str = os.path.join("backend", "data", "jobs.sqlite3")
+    TRAINING_MAX_JOBS: int = max(1, (os.cpu_count() or 2) // 2)  # Concurrent training processes
+    TRAINING_CHUNK_ROWS: int = 50000  # Rows per chunk read in streaming mode
+    STREAMING_HASH_FEATURES: int = 2 ** 20  # Hashed TF-IDF columns in streaming mode
+    STREAMING_TEST_ROWS: int = 100000  # Held-out rows kept for evaluation in streaming mode
+
+    # Cached TF-IDF features
+    FEATURE_STORE_DIR: str = os.path.join("backend", "data", "features")
+    FEATURE_STORE_MAX_ENTRIES: int = 4  # Fitted splits kept on disk, least recently used evicted
+    TRANSFORM_CACHE_SIZE: int = 50000  # Vectorized texts kept per model for prediction
+
+    # Model Registry
+    MODEL_MEMORY_BUDGET_MB: int = 2048  # Idle LSTM/BERT models are evicted above this
+    PRELOAD_MODELS: List[str] = ["SVM", "RF", "LR"]  # Loaded at startup if saved
+
+    # SVM
+    SVM_SOLVER: str = "linear"  # "linear" (liblinear), "sgd" (hinge SGD) or "svc" (kernel SVC, small data only)
+
+    # BERT inference
+    BERT_BACKEND: str = "torch"  # "onnx" serves predictions from the exported ONNX graph
+    BERT_BATCH_SIZE: int = 16
+    BERT_INTRA_OP_THREADS: int = os.cpu_count() or 1  # onnxruntime threads per operator
+    BERT_INTER_OP_THREADS: int = 1
+
+    # Dynamic INT8 quantization of LSTM/BERT (torch backend, CPU)
+    QUANTIZED_INFERENCE: bool = False  # Serve INT8 variants that passed the accuracy gate
+    QUANTIZATION_F1_TOLERANCE: float = 0.01  # Max F1 drop on the held-out split
+
+    # Cascade inference (model_type "CASCADE"); scripts.tune_cascade writes tuned values to saved_models/cascade.json
+    CASCADE_FAST_MODEL: str = "LR"
+    CASCADE_SLOW_MODEL: str = "BERT"
+    CASCADE_MARGIN_THRESHOLD: float = 0.5  # Texts with P(top) - P(other) below this go to the slow model
+
+    # Prediction micro-batching
+    PREDICT_MAX_BATCH_SIZE: int = 64
+    PREDICT_MAX_WAIT_MS: float = 5.0
+
+    # Inference worker pools (process pool for sklearn/LIME, threads for torch)
+    INFERENCE_PROCESS_WORKERS: int = max(1, (os.cpu_count() or 2) - 1)  # 0 runs everything on threads
+    INFERENCE_THREAD_WORKERS: int = 4
+    INFERENCE_MAX_QUEUE: int = 32  # Pending jobs per pool beyond the workers before returning 503
+
+    # Prediction / explanation result cache
+    RESULT_CACHE_SIZE: int = 100000  # Entries
+    RESULT_CACHE_TTL_SECONDS: float = 3600.0
+    RESULT_CACHE_PATH: str = ""  # Set to a file path to persist the cache across restarts
+
+    # Explanations
+    LIME_NUM_SAMPLES: int = 5000  # Perturbations per text, lowered to fit a request's time budget
+    SHAP_MAX_EVALS: int = 300  # Model evaluations per text for LSTM/BERT (partition SHAP)
+    SHAP_BATCH_SIZE: int = 64  # Masked texts scored per model call
+
     class Config:
         case_sensitive = True
 
@@ -28,6 +112,7 @@ settings = Settings()
 
 # Ensure directories exist
 os.makedirs(settings.TRAINED_DATA_DIR, exist_ok=True)
+os.makedirs(settings.FEATURE_STORE_DIR, exist_ok=True)
 os.makedirs(settings.LIVE_DATA_DIR, exist_ok=True)
 os.makedirs(settings.PREVIOUS_DATA_DIR, exist_ok=True)
 os.makedirs(settings.MODEL_SAVE_DIR, exist_ok=True)
@@ -1,8 +1,16 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.model.registry import registry
+from app.utils.executor import PoolSaturated, shutdown_pools
+from app.utils.twitter_client import twitter_client
+from app.utils.tracker import tracker
+from app.utils.cache import result_cache
+from app.utils.jobs import job_engine, job_store
+from app.utils.live_store import live_store
 # Import routers (placeholders for now, will be implemented)
-from app.routes import train, predict, live_twitter, metrics, compare, classical_models, explain, reset, dashboard
+from app.routes import train, predict, live_twitter, metrics, compare, classical_models, explain, reset, dashboard, datasets
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -23,6 +31,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def warm_up():
+    # Warm the shared model registry so the first requests don't pay load time
+    registry.preload()
+    result_cache.load()
+    job_store.fail_orphaned()
+    live_store.start()
+
+@app.on_event("shutdown")
+async def stop_background_resources():
+    tracker.stop_all()
+    shutdown_pools()
+    job_engine.shutdown()
+    result_cache.save()
+    live_store.stop()
+    await twitter_client.aclose()
+
+@app.exception_handler(PoolSaturated)
+def pool_saturated_handler(request: Request, exc: PoolSaturated):
+    # Backpressure: ask clients to retry instead of queueing without bound
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Sentiment Analysis & Explainability API"}
@@ -37,3 +67,4 @@ app.include_router(compare.router, prefix="/compare", tags=["Comparison"])
 app.include_router(explain.router, prefix="/api", tags=["Explainability"])
 app.include_router(reset.router, prefix="/api", tags=["System"])
 app.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+app.include_router(datasets.router, prefix="/datasets", tags=["Datasets"])
@@ -1,72 +1,98 @@
-from transformers import DistilBertTokenizer, DistilBertForSequenceClassification, AdamW
+from transformers import DistilBertTokenizerFast, DistilBertForSequenceClassification
 import torch
-from torch.utils.data import DataLoader, Dataset
+from torch.optim import AdamW
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
 import os
+import numpy as np
 from app.config import settings
+from app.model.bert_onnx import export_onnx, OnnxBertSession
+from app.model.quantization import quantize_dynamic, quantization_enabled
+from app.model.registry import artifact_version
 
-class BertDataset(Dataset):
-    def __init__(self, encodings, labels=None):
-        self.encodings = encodings
-        self.labels = labels
+def encode(tokenizer, texts):
+    """
+    Tokenizes all texts in one fast-tokenizer call and packs them into
+    pre-built padded arrays, shortest texts first.
+    Returns (input_ids, attention_mask, lengths), each row in input order.
+    """
+    texts = list(texts)
+    ids = tokenizer(texts, truncation=True)['input_ids'] if texts else []
+    lengths = np.fromiter((len(row) for row in ids), dtype=np.int64, count=len(ids))
+    width = int(lengths.max()) if len(ids) else 0
+    attention_mask = np.arange(width)[None, :] < lengths[:, None]
+    input_ids = np.full((len(ids), width), tokenizer.pad_token_id, dtype=np.int64)
+    if len(ids):
+        input_ids[attention_mask] = np.concatenate(ids)
+    return input_ids, attention_mask.astype(np.int64), lengths
 
-    def __getitem__(self, idx):
-        item = {key: torch.tensor(val[idx]) for key, val in self.encodings.items()}
-        if self.labels is not None:
-            item['labels'] = torch.tensor(self.labels[idx])
-        return item
-
-    def __len__(self):
-        return len(self.encodings['input_ids'])
+def length_batches(lengths, batch_size, rng=None):
+    """
+    Splits row indices into batches of similar length, so each batch is only
+    padded to its own longest text. With rng (training), ties are broken
+    randomly and the batch order is shuffled.
+    """
+    if rng is None:
+        order = np.argsort(lengths, kind="stable")
+    else:
+        order = np.lexsort((rng.random(len(lengths)), lengths))
+    batches = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+    if rng is not None:
+        rng.shuffle(batches)
+    return batches
 
 class BertModelWrapper:
-    def __init__(self):
+    def __init__(self, pretrained=True, backend=None):
+        """
+        pretrained: download the base DistilBERT weights. Pass False when the
+        wrapper is only used to load() a saved model (e.g. from the registry).
+        backend: "torch" or "onnx", defaults to settings.BERT_BACKEND.
+        """
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        self.tokenizer = DistilBertTokenizer.from_pretrained('distilbert-base-uncased')
-        self.model = DistilBertForSequenceClassification.from_pretrained('distilbert-base-uncased', num_labels=2)
-        self.model.to(self.device)
+        self.backend = backend or settings.BERT_BACKEND
+        self.tokenizer = None
+        self.model = None
+        self.session = None
+        if pretrained:
+            self.tokenizer = DistilBertTokenizerFast.from_pretrained('distilbert-base-uncased')
+            self.model = DistilBertForSequenceClassification.from_pretrained('distilbert-base-uncased', num_labels=2)
+            self.model.to(self.device)
         self.model_path = os.path.join(settings.MODEL_SAVE_DIR, "bert_model")
+        self.onnx_path = os.path.join(settings.MODEL_SAVE_DIR, "bert_onnx")
+
+    def _batch(self, input_ids, attention_mask, lengths, rows):
+        # Slice pre-built arrays down to this batch's longest text
+        width = int(lengths[rows].max())
+        return input_ids[rows, :width], attention_mask[rows, :width]
+
+    def train(self, texts, labels, epochs=3, batch_size=16, on_epoch=None):
+        """
+        on_epoch: optional callback(epoch, epochs) run after every epoch.
+        """
+        input_ids, attention_mask, lengths = encode(self.tokenizer, texts)
+        labels = torch.as_tensor(np.asarray(labels), dtype=torch.long)
+        rng = np.random.default_rng()
 
-    def train(self, texts, labels, epochs=3, batch_size=16):
-        encodings = self.tokenizer(texts, truncation=True, padding=True)
-        dataset = BertDataset(encodings, labels)
-        loader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
-        
         optimizer = AdamW(self.model.parameters(), lr=5e-5)
         
         self.model.train()
         for epoch in range(epochs):
-            for batch in loader:
+            for rows in length_batches(lengths, batch_size, rng):
+                batch_ids, batch_mask = self._batch(input_ids, attention_mask, lengths, rows)
                 optimizer.zero_grad()
-                input_ids = batch['input_ids'].to(self.device)
-                attention_mask = batch['attention_mask'].to(self.device)
-                labels = batch['labels'].to(self.device)
-                
-                outputs = self.model(input_ids, attention_mask=attention_mask, labels=labels)
+                outputs = self.model(
+                    torch.from_numpy(batch_ids).to(self.device),
+                    attention_mask=torch.from_numpy(batch_mask).to(self.device),
+                    labels=labels[rows].to(self.device)
+                )
                 loss = outputs.loss
                 loss.backward()
                 optimizer.step()
+            if on_epoch is not None:
+                on_epoch(epoch + 1, epochs)
     
     def evaluate(self, texts, labels):
-        encodings = self.tokenizer(texts, truncation=True, padding=True)
-        dataset = BertDataset(encodings, labels)
-        loader = DataLoader(dataset, batch_size=16)
-        
-        self.model.eval()
-        predictions = []
-        true_labels = []
-        
-        with torch.no_grad():
-            for batch in loader:
-                input_ids = batch['input_ids'].to(self.device)
-                attention_mask = batch['attention_mask'].to(self.device)
-                labels = batch['labels'].to(self.device)
-                
-                outputs = self.model(input_ids, attention_mask=attention_mask)
-                preds = torch.argmax(outputs.logits, dim=1)
-                
-                predictions.extend(preds.cpu().numpy())
-                true_labels.extend(labels.cpu().numpy())
+        predictions = self.predict(texts)
+        true_labels = list(labels)
         
         metrics = {
             "accuracy": float(accuracy_score(true_labels, predictions)),
@@ -77,33 +103,67 @@ class BertModelWrapper:
         }
         return metrics
 
+    def _logits(self, input_ids, attention_mask):
+        if self.session is not None:
+            return self.session.logits(input_ids, attention_mask)
+
+        with torch.inference_mode():
+            outputs = self.model(
+                torch.from_numpy(input_ids).to(self.device),
+                attention_mask=torch.from_numpy(attention_mask).to(self.device)
+            )
+        return outputs.logits.float().cpu().numpy()
+
+    def predict_proba(self, texts):
+        if self.session is None:
+            self.model.eval()
+
+        input_ids, attention_mask, lengths = encode(self.tokenizer, texts)
+        probabilities = np.zeros((len(lengths), 2), dtype=np.float32)  # Negative, Positive
+        for rows in length_batches(lengths, settings.BERT_BATCH_SIZE):
+            logits = self._logits(*self._batch(input_ids, attention_mask, lengths, rows))
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            # Written back by row index, so output follows the input order
+            probabilities[rows] = exp / exp.sum(axis=1, keepdims=True)
+
+        return probabilities
+
     def predict(self, texts):
-        encodings = self.tokenizer(texts, truncation=True, padding=True)
-        dataset = BertDataset(encodings)
-        loader = DataLoader(dataset, batch_size=16)
-        
-        self.model.eval()
-        predictions = []
-        
-        with torch.no_grad():
-            for batch in loader:
-                input_ids = batch['input_ids'].to(self.device)
-                attention_mask = batch['attention_mask'].to(self.device)
-                
-                outputs = self.model(input_ids, attention_mask=attention_mask)
-                preds = torch.argmax(outputs.logits, dim=1)
-                predictions.extend(preds.cpu().numpy())
-                
-        return predictions
+        return list(np.argmax(self.predict_proba(texts), axis=1))
 
     def save(self):
         self.model.save_pretrained(self.model_path)
         self.tokenizer.save_pretrained(self.model_path)
+        if self.backend == "onnx":
+            self.export()
+
+    def export(self):
+        """
+        Writes the ONNX graph and tokenizer served by the "onnx" backend.
+        """
+        export_onnx(self.model, self.tokenizer, self.onnx_path)
+        self.model.to(self.device)
 
     def load(self):
-        if os.path.exists(self.model_path):
-            self.model = DistilBertForSequenceClassification.from_pretrained(self.model_path)
-            self.tokenizer = DistilBertTokenizer.from_pretrained(self.model_path)
-            self.model.to(self.device)
-        else:
+        if not os.path.exists(self.model_path):
             raise FileNotFoundError("BERT model not found")
+
+        if self.backend == "onnx":
+            # Export on first use, or again if the checkpoint was retrained since
+            if artifact_version(self.onnx_path) < artifact_version(self.model_path):
+                self.model = DistilBertForSequenceClassification.from_pretrained(self.model_path)
+                self.tokenizer = DistilBertTokenizerFast.from_pretrained(self.model_path)
+                self.export()
+            self.model = None
+            self.tokenizer = DistilBertTokenizerFast.from_pretrained(self.onnx_path)
+            self.session = OnnxBertSession(
+                self.onnx_path, settings.BERT_INTRA_OP_THREADS, settings.BERT_INTER_OP_THREADS
+            )
+            return
+
+        self.model = DistilBertForSequenceClassification.from_pretrained(self.model_path)
+        self.tokenizer = DistilBertTokenizerFast.from_pretrained(self.model_path)
+        self.session = None
+        if self.device.type == 'cpu' and quantization_enabled(self.model_path):
+            self.model = quantize_dynamic(self.model)
+        self.model.to(self.device)
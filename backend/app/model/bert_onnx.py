@@ -0,0 +1,60 @@
+import os
+import numpy as np
+import torch
+
+ONNX_FILE = "model.onnx"
+
+def export_onnx(model, tokenizer, export_dir: str):
+    """
+    Writes a DistilBERT classifier as an ONNX graph (dynamic batch and
+    sequence length) plus its tokenizer to export_dir.
+    Inputs: input_ids, attention_mask (int64). Output: logits.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    model = model.to("cpu").eval()
+    sample = tokenizer(["an example tweet"], return_tensors="pt")
+    tmp_path = os.path.join(export_dir, ONNX_FILE + ".tmp")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            tmp_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"}
+            },
+            opset_version=17,
+            dynamo=False
+        )
+    tokenizer.save_pretrained(export_dir)
+    # Readers only ever see a complete graph
+    os.replace(tmp_path, os.path.join(export_dir, ONNX_FILE))
+
+class OnnxBertSession:
+    """
+    onnxruntime CPU session for a graph written by export_onnx.
+
+    intra_op_threads parallelise a single matmul, inter_op_threads run
+    independent graph nodes concurrently; DistilBERT is a chain of layers,
+    so most of the gain comes from intra-op threads.
+    """
+    def __init__(self, export_dir: str, intra_op_threads: int = 0, inter_op_threads: int = 1):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        self.session = ort.InferenceSession(
+            os.path.join(export_dir, ONNX_FILE), options, providers=["CPUExecutionProvider"]
+        )
+
+    def logits(self, input_ids, attention_mask):
+        return self.session.run(["logits"], {
+            "input_ids": np.asarray(input_ids, dtype=np.int64),
+            "attention_mask": np.asarray(attention_mask, dtype=np.int64)
+        })[0]
@@ -0,0 +1,86 @@
+import weakref
+from app.config import settings
+from app.model.registry import registry
+from app.model.lime_explain import LimeExplainer
+from app.model.linear_explain import LinearExplainer
+from app.model.shap_explain import ShapExplainer, TreeShapExplainer
+
+lime_explainer = LimeExplainer()
+
+# Explainers per fitted model, dropped with it on hot-swap
+_linear_explainers = weakref.WeakKeyDictionary()
+_tree_explainers = weakref.WeakKeyDictionary()
+_shap_explainers = weakref.WeakKeyDictionary()
+
+def linear_explainer_for(model):
+    """
+    Returns a LinearExplainer for linear TF-IDF pipelines (LR, linear SVM),
+    or None for models that need a sampling explainer (RF, LSTM, BERT).
+    """
+    pipeline = getattr(model, "model", None)
+    if pipeline is None or not LinearExplainer.supports(pipeline):
+        return None
+    if pipeline not in _linear_explainers:
+        _linear_explainers[pipeline] = LinearExplainer(pipeline)
+    return _linear_explainers[pipeline]
+
+def tree_explainer_for(model):
+    """
+    Returns a TreeShapExplainer for TF-IDF tree ensembles (RF), or None.
+    """
+    pipeline = getattr(model, "model", None)
+    if pipeline is None or not TreeShapExplainer.supports(pipeline):
+        return None
+    if pipeline not in _tree_explainers:
+        _tree_explainers[pipeline] = TreeShapExplainer(pipeline)
+    return _tree_explainers[pipeline]
+
+def shap_explainer_for(model):
+    """
+    Returns a partition SHAP explainer over model.predict_proba, reused for
+    every text the resident model explains (LSTM, BERT).
+    """
+    if model not in _shap_explainers:
+        import shap
+        # A weak reference, so the cached explainer doesn't keep the model alive
+        model_ref = weakref.ref(model)
+        _shap_explainers[model] = ShapExplainer(
+            lambda texts: model_ref().predict_proba(texts), shap.maskers.Text(r"\W+"),
+            max_evals=settings.SHAP_MAX_EVALS, batch_size=settings.SHAP_BATCH_SIZE
+        )
+    return _shap_explainers[model]
+
+def explain_text(model_type: str, text: str, method: str = "LIME", num_features: int = 10):
+    """
+    Explains a single cleaned text with the resident model.
+    Returns a list of (token, weight) tuples.
+    """
+    return explain_texts(model_type, [text], method, num_features)[0]
+
+def explain_texts(model_type: str, texts, method: str = "LIME", num_features: int = 10, time_budget: float = None):
+    """
+    Explains a batch of cleaned texts with the resident model.
+    Linear TF-IDF models (LR, SVM) are answered exactly in closed form for
+    both methods: tfidf * coef is their linear SHAP against the empty text.
+    SHAP uses Tree SHAP for RF and a capped partition explainer otherwise;
+    LIME perturbations of the whole batch are scored in large vectorized calls.
+    Returns one list of (token, weight) tuples per text, or None for texts
+    SHAP could not reach within time_budget.
+    """
+    with registry.lease(model_type) as model:
+        if not hasattr(model, "predict_proba"):
+            raise NotImplementedError(f"{model_type} model does not support explanations")
+        linear = linear_explainer_for(model)
+        if method in ("LIME", "SHAP") and linear is not None:
+            return linear.explain_batch(texts, num_features)
+        if method == "LIME":
+            return lime_explainer.explain_batch(
+                texts, model.predict_proba, num_features=num_features,
+                num_samples=settings.LIME_NUM_SAMPLES, time_budget=time_budget
+            )
+        if method == "SHAP":
+            tree = tree_explainer_for(model)
+            if tree is not None:
+                return tree.explain_batch(texts, num_features)
+            return shap_explainer_for(model).explain_batch(texts, num_features, time_budget)
+    raise ValueError(f"Unknown explainability method: {method}")
@@ -1,9 +1,12 @@
-from lime.lime_text import LimeTextExplainer
-from sklearn.pipeline import make_pipeline
+import time
+from itertools import compress
+import numpy as np
+from lime.lime_text import LimeTextExplainer, IndexedString
 
 class LimeExplainer:
-    def __init__(self, class_names=['Negative', 'Positive']):
-        self.explainer = LimeTextExplainer(class_names=class_names)
+    def __init__(self, class_names=['Negative', 'Positive'], random_state=None):
+        self.explainer = LimeTextExplainer(class_names=class_names, random_state=random_state)
+        self.random_state = np.random.RandomState(random_state)
 
     def explain(self, text, predict_proba_fn, num_features=10):
         """
@@ -12,3 +15,82 @@ class LimeExplainer:
         """
         exp = self.explainer.explain_instance(text, predict_proba_fn, num_features=num_features)
         return exp.as_list()
+
+    def _neighborhood(self, text, num_samples):
+        """
+        Same perturbation scheme as LimeTextExplainer: row 0 is the original
+        text, every other row hides a random subset of its words.
+        Returns (indexed_string, binary mask matrix, perturbed texts, distances).
+        """
+        indexed = IndexedString(text, bow=self.explainer.bow,
+                                split_expression=self.explainer.split_expression,
+                                mask_string=self.explainer.mask_string)
+        doc_size = indexed.num_words()
+
+        # Hide `size` random words per row: the words with the lowest random keys
+        sizes = self.random_state.randint(1, doc_size + 1, num_samples - 1)
+        ranks = np.argsort(self.random_state.rand(num_samples - 1, doc_size), axis=1).argsort(axis=1)
+        data = np.ones((num_samples, doc_size))
+        data[1:] = ranks >= sizes[:, None]
+
+        # Equivalent to indexed.inverse_removing() per row, without the per-row
+        # Python bookkeeping: map each token to its word feature (-1 for separators)
+        tokens = indexed.as_list
+        token_feature = np.full(len(tokens), -1)
+        for feature, positions in enumerate(indexed.positions):
+            token_feature[positions] = feature
+        is_word = token_feature >= 0
+        keep = np.ones((num_samples, len(tokens)), dtype=bool)
+        keep[:, is_word] = data[:, token_feature[is_word]] > 0
+        texts = [''.join(compress(tokens, row)) for row in keep.tolist()]
+
+        # Cosine distance between each binary row and the all-ones original, times 100
+        distances = (1 - np.sqrt(data.sum(axis=1) / doc_size)) * 100
+        return indexed, data, texts, distances
+
+    def _budget_samples(self, texts, predict_proba_fn, num_samples, time_budget, min_samples):
+        # Estimate the per-sample model cost on a small probe, then fit the budget
+        probe_size = min(num_samples, 200)
+        _, _, probe, _ = self._neighborhood(texts[0], probe_size)
+        start = time.perf_counter()
+        predict_proba_fn(probe)
+        per_sample = (time.perf_counter() - start) / probe_size
+        affordable = int(time_budget * 0.8 / (per_sample * len(texts)))
+        return max(min_samples, min(num_samples, affordable))
+
+    def explain_batch(self, texts, predict_proba_fn, num_features=10, num_samples=5000,
+                      time_budget=None, min_samples=100, chunk_size=20000, label=1):
+        """
+        Generates LIME explanations for many texts at once.
+
+        Perturbations of all texts are scored together, chunk_size texts per
+        predict_proba_fn call, instead of one call per instance.
+        time_budget: seconds; lowers num_samples (not below min_samples) so
+        that scoring the whole batch fits in the budget.
+        Returns one [(word, weight), ...] list per text, like explain().
+        """
+        explanations = [[] for _ in texts]
+        # Texts without words have nothing to explain
+        active = [i for i, text in enumerate(texts) if IndexedString(
+            text, bow=self.explainer.bow, split_expression=self.explainer.split_expression).num_words() > 0]
+        if not active:
+            return explanations
+
+        if time_budget:
+            num_samples = self._budget_samples([texts[i] for i in active], predict_proba_fn,
+                                               num_samples, time_budget, min_samples)
+
+        neighborhoods = [self._neighborhood(texts[i], num_samples) for i in active]
+        perturbed = [t for _, _, batch, _ in neighborhoods for t in batch]
+        proba = np.vstack([
+            np.asarray(predict_proba_fn(perturbed[start:start + chunk_size]))
+            for start in range(0, len(perturbed), chunk_size)
+        ])
+
+        for n, (i, (indexed, data, _, distances)) in enumerate(zip(active, neighborhoods)):
+            yss = proba[n * num_samples:(n + 1) * num_samples]
+            _, local_exp, _, _ = self.explainer.base.explain_instance_with_data(
+                data, yss, distances, label, num_features,
+                feature_selection=self.explainer.feature_selection)
+            explanations[i] = [(str(indexed.word(feature)), float(weight)) for feature, weight in local_exp]
+        return explanations
@@ -1,67 +1,70 @@
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader, Dataset
+from torch.nn.utils.rnn import pack_padded_sequence
+from torch.utils.data import DataLoader, TensorDataset
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
 import os
 import numpy as np
 from app.config import settings
+from app.model.quantization import quantize_dynamic, quantization_enabled
+from app.model.vocab import Vocabulary, PAD_ID
 
 class LSTMNet(nn.Module):
     def __init__(self, vocab_size, embedding_dim, hidden_dim, output_dim, n_layers, dropout):
         super(LSTMNet, self).__init__()
-        self.embedding = nn.Embedding(vocab_size, embedding_dim)
+        self.embedding = nn.Embedding(vocab_size, embedding_dim, padding_idx=PAD_ID)
         self.lstm = nn.LSTM(embedding_dim, hidden_dim, num_layers=n_layers, dropout=dropout, batch_first=True)
         self.fc = nn.Linear(hidden_dim, output_dim)
         self.sigmoid = nn.Sigmoid()
 
-    def forward(self, x):
+    def forward(self, x, lengths):
         embedded = self.embedding(x)
-        out, (hidden, cell) = self.lstm(embedded)
+        # Packed, so the LSTM stops at each text's last real token
+        packed = pack_padded_sequence(embedded, lengths.cpu(), batch_first=True, enforce_sorted=False)
+        out, (hidden, cell) = self.lstm(packed)
         # Use simple last hidden state
         final_hidden = hidden[-1]
         out = self.fc(final_hidden)
         return self.sigmoid(out)
 
-class SentimentDataset(Dataset):
-    def __init__(self, X, y):
-        self.X = torch.tensor(X, dtype=torch.long)
-        self.y = torch.tensor(y, dtype=torch.float32)
-
-    def __len__(self):
-        return len(self.X)
-
-    def __getitem__(self, idx):
-        return self.X[idx], self.y[idx]
-
 class LSTMModel:
-    def __init__(self, vocab_size=5000, embedding_dim=100, hidden_dim=256, output_dim=1, n_layers=2, dropout=0.5):
+    def __init__(self, vocab_size=5000, embedding_dim=100, hidden_dim=256, output_dim=1, n_layers=2, dropout=0.5, max_len=64):
         self.model = LSTMNet(vocab_size, embedding_dim, hidden_dim, output_dim, n_layers, dropout)
         self.criterion = nn.BCELoss()
         self.optimizer = optim.Adam(self.model.parameters())
         self.model_path = os.path.join(settings.MODEL_SAVE_DIR, "lstm_model.pth")
-        self.vocab = None # Should store tokenizer/vocab mapping
+        self.vocab_size = vocab_size
+        self.max_len = max_len
+        self.vocab = None  # Vocabulary, built from the training texts
 
-    def train(self, X_train, y_train, epochs=5, batch_size=64):
-        # NOTE: X_train should already be padded sequences
-        dataset = SentimentDataset(X_train, y_train)
+    def train(self, X_train, y_train, epochs=5, batch_size=64, on_epoch=None):
+        """
+        X_train: cleaned texts. The vocabulary is built from them on first training.
+        on_epoch: optional callback(epoch, epochs) run after every epoch.
+        """
+        if self.vocab is None:
+            self.vocab = Vocabulary.build(X_train, self.vocab_size)
+        ids, lengths = self.vocab.encode(X_train, self.max_len)
+        dataset = TensorDataset(
+            torch.from_numpy(ids).long(), torch.from_numpy(lengths),
+            torch.as_tensor(np.asarray(y_train), dtype=torch.float32)
+        )
         loader = DataLoader(dataset, batch_size=batch_size, shuffle=True)
         
         self.model.train()
         for epoch in range(epochs):
-            for inputs, labels in loader:
+            for inputs, input_lengths, labels in loader:
                 self.optimizer.zero_grad()
-                outputs = self.model(inputs)
-                loss = self.criterion(outputs.squeeze(), labels)
+                outputs = self.model(inputs, input_lengths)
+                loss = self.criterion(outputs.squeeze(1), labels)
                 loss.backward()
                 self.optimizer.step()
+            if on_epoch is not None:
+                on_epoch(epoch + 1, epochs)
     
     def evaluate(self, X_test, y_test):
-        self.model.eval()
-        with torch.no_grad():
-            inputs = torch.tensor(X_test, dtype=torch.long)
-            outputs = self.model(inputs)
-            y_pred = (outputs.squeeze() > 0.5).float().numpy()
+        y_pred = self.predict(X_test)
             
         metrics = {
             "accuracy": float(accuracy_score(y_test, y_pred)),
@@ -72,24 +75,40 @@ class LSTMModel:
         }
         return metrics
 
-    def predict(self, X):
+    def predict_proba(self, texts, batch_size=256):
+        """
+        Returns an (n_texts, 2) array of [Negative, Positive] probabilities.
+        """
+        ids, lengths = self.vocab.encode(list(texts), self.max_len)
+        positive = np.zeros(len(lengths), dtype=np.float32)
         self.model.eval()
-        with torch.no_grad():
-            inputs = torch.tensor(X, dtype=torch.long)
-            outputs = self.model(inputs)
-            y_pred = (outputs.squeeze() > 0.5).int().numpy()
-        return y_pred
+        with torch.inference_mode():
+            for start in range(0, len(lengths), batch_size):
+                end = start + batch_size
+                batch_lengths = lengths[start:end]
+                # Trim the batch to its own longest text
+                inputs = torch.from_numpy(ids[start:end, :batch_lengths.max()]).long()
+                outputs = self.model(inputs, torch.from_numpy(batch_lengths))
+                positive[start:end] = outputs.squeeze(1).numpy()
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, texts):
+        return (self.predict_proba(texts)[:, 1] > 0.5).astype(int)
 
     def save(self):
         torch.save({
             'model_state_dict': self.model.state_dict(),
-            'vocab': self.vocab
+            'vocab': self.vocab.to_state(),
+            'max_len': self.max_len
         }, self.model_path)
 
     def load(self):
         if os.path.exists(self.model_path):
-            checkpoint = torch.load(self.model_path)
+            checkpoint = torch.load(self.model_path, map_location='cpu')
             self.model.load_state_dict(checkpoint['model_state_dict'])
-            self.vocab = checkpoint.get('vocab')
+            self.vocab = Vocabulary.from_state(checkpoint['vocab'])
+            self.max_len = checkpoint.get('max_len', self.max_len)
+            if quantization_enabled(self.model_path):
+                self.model = quantize_dynamic(self.model)
         else:
             raise FileNotFoundError("LSTM model not found")
@@ -0,0 +1,65 @@
+import json
+import os
+import torch
+import torch.nn as nn
+from app.config import settings
+from app.model.registry import artifact_version
+
+def quantize_dynamic(module: nn.Module) -> nn.Module:
+    """
+    Returns a copy of module with nn.Linear and nn.LSTM weights stored as INT8
+    and activations quantized on the fly. CPU only.
+    """
+    return torch.ao.quantization.quantize_dynamic(module.cpu().eval(), {nn.Linear, nn.LSTM}, dtype=torch.qint8)
+
+def gate_path(model_path: str) -> str:
+    # Next to the artifact rather than inside it, so it doesn't change the model version
+    return model_path.rstrip(os.sep) + ".quantization.json"
+
+def run_quantization_gate(wrapper, X_test, y_test, tolerance: float = None) -> bool:
+    """
+    Evaluates a saved wrapper (LSTMModel, BertModelWrapper) in FP32 and INT8
+    on the held-out split and records whether the INT8 variant may serve:
+    its weighted F1 must not drop more than tolerance below FP32.
+    Call after wrapper.save(); the decision is tied to that artifact version.
+    """
+    if tolerance is None:
+        tolerance = settings.QUANTIZATION_F1_TOLERANCE
+    if getattr(wrapper, "device", torch.device("cpu")).type != "cpu":
+        print(f"Skipping INT8 quantization gate for {wrapper.model_path}: CPU only")
+        return False
+
+    fp32_model = wrapper.model
+    f1_fp32 = wrapper.evaluate(X_test, y_test)["f1_score"]
+    wrapper.model = quantize_dynamic(fp32_model)
+    try:
+        f1_int8 = wrapper.evaluate(X_test, y_test)["f1_score"]
+    finally:
+        wrapper.model = fp32_model.to(getattr(wrapper, "device", "cpu"))
+
+    enabled = f1_fp32 - f1_int8 <= tolerance
+    with open(gate_path(wrapper.model_path), "w") as f:
+        json.dump({
+            "enabled": enabled,
+            "f1_fp32": f1_fp32,
+            "f1_int8": f1_int8,
+            "tolerance": tolerance,
+            "model_version": artifact_version(wrapper.model_path)
+        }, f)
+    print(f"INT8 quantization {'enabled' if enabled else 'rejected'} for {wrapper.model_path}: "
+          f"F1 {f1_fp32:.4f} -> {f1_int8:.4f}")
+    return enabled
+
+def quantization_enabled(model_path: str) -> bool:
+    """
+    True if quantized serving is switched on and the saved artifact passed the
+    accuracy gate. Decisions recorded for an older version are ignored.
+    """
+    if not settings.QUANTIZED_INFERENCE:
+        return False
+    try:
+        with open(gate_path(model_path)) as f:
+            gate = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return bool(gate.get("enabled")) and gate.get("model_version") == artifact_version(model_path)
@@ -0,0 +1,227 @@
+import os
+import threading
+import time
+import numpy as np
+from contextlib import contextmanager
+from app.config import settings
+
+MODEL_TYPES = ["SVM", "RF", "LR", "LSTM", "BERT"]
+HEAVY_MODELS = ["LSTM", "BERT"]
+
+SENTIMENT_NAMES = {0: "Negative", 1: "Positive"}
+
+def build_model(model_type: str):
+    """
+    Returns a fresh, untrained wrapper for the given model type.
+    Imports are done lazily so torch/transformers are only loaded when needed.
+    """
+    if model_type == "SVM":
+        from app.model.svm_model import SVMModel
+        return SVMModel()
+    if model_type == "RF":
+        from app.model.rf_model import RFModel
+        return RFModel()
+    if model_type == "LR":
+        from app.model.lr_model import LRModel
+        return LRModel()
+    if model_type == "LSTM":
+        from app.model.lstm_model import LSTMModel
+        return LSTMModel()
+    if model_type == "BERT":
+        from app.model.bert_model import BertModelWrapper
+        # Weights come from the saved artifact, no need to download the base model
+        return BertModelWrapper(pretrained=False)
+    raise ValueError(f"Unknown model type: {model_type}")
+
+def class_labels(model):
+    """
+    Returns the sentiment names matching the columns of model.predict_proba.
+    """
+    classes = getattr(model.model, "classes_", [0, 1])
+    return [SENTIMENT_NAMES.get(c, str(c).capitalize()) for c in classes]
+
+def _artifact_paths(path):
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in files:
+                yield os.path.join(root, name)
+    elif os.path.exists(path):
+        yield path
+
+def artifact_version(path: str) -> int:
+    """
+    Version of a saved artifact, derived from its modification time so that
+    every process (API workers, pool workers) agrees on it.
+    """
+    return max((os.stat(p).st_mtime_ns for p in _artifact_paths(path)), default=0)
+
+def artifact_size(path: str) -> int:
+    return sum(os.path.getsize(p) for p in _artifact_paths(path))
+
+class ModelEntry:
+    def __init__(self, model_type, model):
+        self.model_type = model_type
+        self.model = model
+        self.version = artifact_version(model.model_path)
+        self.size_bytes = artifact_size(model.model_path)
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+class ModelRegistry:
+    """
+    Process-wide cache of loaded models.
+
+    Each model is loaded from settings.MODEL_SAVE_DIR once and shared by all
+    routes. Retrained models are swapped in atomically: requests already holding
+    a lease keep using the old instance until they finish.
+    """
+    def __init__(self, memory_budget_mb=None):
+        if memory_budget_mb is None:
+            memory_budget_mb = settings.MODEL_MEMORY_BUDGET_MB
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._load_locks = {model_type: threading.Lock() for model_type in MODEL_TYPES}
+
+    def _load_lock(self, model_type):
+        if model_type not in self._load_locks:
+            raise ValueError(f"Unknown model type: {model_type}")
+        return self._load_locks[model_type]
+
+    def get(self, model_type: str) -> ModelEntry:
+        """
+        Returns the resident entry for model_type, loading it on first use.
+        Raises FileNotFoundError if the model has not been trained yet.
+        """
+        entry = self._entries.get(model_type)
+        if entry is None:
+            with self._load_lock(model_type):
+                entry = self._entries.get(model_type)
+                if entry is None:
+                    model = build_model(model_type)
+                    model.load()
+                    entry = self._install(model_type, model)
+        entry.last_used = time.monotonic()
+        return entry
+
+    @contextmanager
+    def lease(self, model_type: str):
+        """
+        Context manager yielding the current model. The model is not evicted
+        while the lease is held, even if a newer version is swapped in.
+        """
+        with self._lock:
+            entry = self._entries.get(model_type)
+            if entry is not None:
+                entry.in_flight += 1
+        if entry is None:
+            entry = self.get(model_type)
+            with self._lock:
+                entry.in_flight += 1
+        try:
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.in_flight -= 1
+                entry.last_used = time.monotonic()
+
+    def version(self, model_type: str) -> int:
+        entry = self._entries.get(model_type)
+        return entry.version if entry else 0
+
+    def swap(self, model_type: str, model) -> ModelEntry:
+        """
+        Installs an already loaded model as the new version of model_type.
+        """
+        with self._load_lock(model_type):
+            return self._install(model_type, model)
+
+    def reload(self, model_type: str):
+        """
+        Loads the latest saved artifact for model_type and swaps it in.
+        Used after training finishes. Returns None if nothing is saved.
+        """
+        model = build_model(model_type)
+        try:
+            model.load()
+        except FileNotFoundError:
+            return None
+        return self.swap(model_type, model)
+
+    def ensure_version(self, model_type: str, version: int):
+        """
+        Reloads model_type if this process holds a different version than the
+        caller expects. Used by pool workers, which keep their own registry.
+        Version 0 means the artifact is gone (e.g. after a reset): the model
+        is unloaded so the next use raises FileNotFoundError instead of
+        serving a deleted model.
+        """
+        if not version:
+            self.unload(model_type)
+        elif self.version(model_type) != version:
+            self.reload(model_type)
+
+    def preload(self, model_types=None):
+        for model_type in model_types or settings.PRELOAD_MODELS:
+            try:
+                self.get(model_type)
+            except FileNotFoundError:
+                print(f"Skipping preload of {model_type}: no saved model")
+
+    def unload(self, model_type: str):
+        with self._lock:
+            self._entries.pop(model_type, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def status(self):
+        with self._lock:
+            return {
+                model_type: {
+                    "version": entry.version,
+                    "size_mb": round(entry.size_bytes / (1024 * 1024), 2),
+                    "in_flight": entry.in_flight,
+                    "idle_seconds": round(time.monotonic() - entry.last_used, 1),
+                }
+                for model_type, entry in self._entries.items()
+            }
+
+    def _install(self, model_type, model):
+        entry = ModelEntry(model_type, model)
+        with self._lock:
+            self._entries[model_type] = entry
+            self._evict_over_budget(keep=model_type)
+        return entry
+
+    def _evict_over_budget(self, keep):
+        # Only heavy (deep learning) models are evicted, least recently used first
+        total = sum(e.size_bytes for e in self._entries.values())
+        candidates = sorted(
+            (e for t, e in self._entries.items() if t in HEAVY_MODELS and t != keep and e.in_flight == 0),
+            key=lambda e: e.last_used,
+        )
+        for entry in candidates:
+            if total <= self.memory_budget:
+                break
+            print(f"Evicting idle {entry.model_type} model to stay under memory budget")
+            del self._entries[entry.model_type]
+            total -= entry.size_bytes
+
+registry = ModelRegistry()
+
+def predict_sentiments(model_type: str, texts):
+    """
+    Scores already cleaned texts with the resident model.
+    Returns a list of (sentiment, confidence) tuples.
+    """
+    from app.model.transform_cache import cached_predict_proba
+
+    with registry.lease(model_type) as model:
+        if not hasattr(model, "predict_proba"):
+            raise NotImplementedError(f"{model_type} model does not support probability scoring")
+        proba = np.asarray(cached_predict_proba(model, texts))
+        labels = class_labels(model)
+    best = proba.argmax(axis=1)
+    return [(labels[i], float(row[i])) for i, row in zip(best, proba)]
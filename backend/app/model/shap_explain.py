@@ -1,18 +1,143 @@
+import math
+import threading
+import time
 import shap
 import numpy as np
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.tree import DecisionTreeClassifier
+
+def _label_values(values, label):
+    # shap returns one array per class (older versions) or a trailing class axis
+    if isinstance(values, list):
+        return np.asarray(values[label])
+    values = np.asarray(values)
+    return values[..., label] if values.ndim == 3 else values
+
+_warmed_up = threading.Event()
+_warm_up_lock = threading.Lock()
+_warm_up_thread = None
+
+def _warm_up():
+    # shap compiles its partition helpers on the first explanation of a process (about 10 s)
+    explainer = shap.Explainer(lambda texts: np.full((len(texts), 2), 0.5), shap.maskers.Text(r"\W+"))
+    explainer(["warm up"], max_evals=10, silent=True)
+    _warmed_up.set()
+
+def start_warm_up():
+    """
+    Starts the one-time shap warm-up in a background thread, if not done yet.
+    """
+    global _warm_up_thread
+    with _warm_up_lock:
+        if _warm_up_thread is None and not _warmed_up.is_set():
+            _warm_up_thread = threading.Thread(target=_warm_up, name="shap-warm-up", daemon=True)
+            _warm_up_thread.start()
+
+def top_tokens(tokens, weights, num_features):
+    ranked = sorted(zip(tokens, weights), key=lambda tw: abs(tw[1]), reverse=True)
+    return [(t, float(w)) for t, w in ranked if t][:num_features]
 
 class ShapExplainer:
-    def __init__(self, model, masker):
+    def __init__(self, model, masker, max_evals=500, batch_size=50):
         """
         model: function that takes a list of strings and returns prediction probabilities
         masker: shap masker (e.g. shap.maskers.Text)
+        max_evals: model evaluations per text; lower is faster and coarser
+        batch_size: masked variants scored per model call
         """
+        self.model = model
         self.explainer = shap.Explainer(model, masker)
+        self.max_evals = max_evals
+        self.batch_size = batch_size
 
-    def explain(self, texts):
-        shap_values = self.explainer(texts)
+    def explain(self, texts, max_evals=None):
+        shap_values = self.explainer(
+            texts, max_evals=max_evals or self.max_evals, batch_size=self.batch_size, silent=True
+        )
         return shap_values
-    
+
+    def _probe_seconds(self, text):
+        # One model call on batch_size variants, times the calls a text may take
+        start = time.perf_counter()
+        self.model([text] * self.batch_size)
+        return (time.perf_counter() - start) * math.ceil(self.max_evals / self.batch_size)
+
+    def explain_batch(self, texts, num_features=10, time_budget=None, label=1):
+        """
+        Explains texts in one explainer call, so the masker and model
+        wrapper are built once for the whole batch.
+        time_budget: seconds; the cost of a text is estimated from one probe
+        call and only as many texts as fit in the remaining budget are
+        explained, the rest are left as None instead of blocking the
+        response. The process' one-time shap warm-up only gets the budget
+        too; if it is not done by then every text is left as None. Texts
+        without words get [].
+        Returns one [(token, weight), ...] list (or None) per text.
+        """
+        explanations = [None if text.strip() else [] for text in texts]
+        active = [i for i, text in enumerate(texts) if text.strip()]
+        deadline = time.perf_counter() + time_budget if time_budget else None
+        if deadline and active and not _warmed_up.is_set():
+            start_warm_up()
+            if not _warmed_up.wait(time_budget):
+                return explanations
+        if deadline and active:
+            per_text = self._probe_seconds(texts[active[0]])
+            fit = int((deadline - time.perf_counter()) / per_text) if per_text > 0 else len(active)
+            active = active[:max(fit, 0)]
+        if not active:
+            return explanations
+        shap_values = self.explain([texts[i] for i in active])
+        for k, i in enumerate(active):
+            tokens = [str(t).strip() for t in shap_values.data[k]]
+            explanations[i] = top_tokens(tokens, shap_values.values[k][:, label], num_features)
+        return explanations
+
     def get_feature_importance(self, shap_values):
         # Summarize the effects of all the features
         return np.abs(shap_values.values).mean(0)
+
+class TreeShapExplainer:
+    """
+    Exact Tree SHAP for make_pipeline(TfidfVectorizer(), <tree ensemble>).
+
+    Attributions are computed on the TF-IDF features (path-dependent, so no
+    background data is needed) and reported for the tokens present in each
+    text. Weights are in probability units for the explained label.
+    """
+    # Densified TF-IDF cells per shap call, bounds memory on large vocabularies
+    MAX_DENSE_CELLS = 5_000_000
+
+    def __init__(self, pipeline, label=1):
+        self.vectorizer = pipeline.steps[0][1]
+        self.explainer = shap.TreeExplainer(pipeline.steps[-1][1])
+        self.feature_names = self.vectorizer.get_feature_names_out()
+        self.label = label
+
+    @staticmethod
+    def supports(pipeline) -> bool:
+        steps = getattr(pipeline, "steps", None)
+        return (
+            steps is not None and len(steps) == 2
+            and isinstance(steps[0][1], TfidfVectorizer)
+            and isinstance(steps[-1][1], (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier))
+        )
+
+    def explain_batch(self, texts, num_features=10):
+        X = self.vectorizer.transform(texts).tocsr()
+        rows_per_call = max(1, self.MAX_DENSE_CELLS // max(1, X.shape[1]))
+        explanations = []
+        for start in range(0, X.shape[0], rows_per_call):
+            chunk = X[start:start + rows_per_call]
+            values = _label_values(
+                self.explainer.shap_values(chunk.toarray(), check_additivity=False), self.label
+            )
+            for row in range(chunk.shape[0]):
+                features = chunk.indices[chunk.indptr[row]:chunk.indptr[row + 1]]
+                tokens = [str(name) for name in self.feature_names[features]]
+                explanations.append(top_tokens(tokens, values[row, features], num_features))
+        return explanations
+
+    def explain(self, text, num_features=10):
+        return self.explain_batch([text], num_features)[0]
@@ -0,0 +1,68 @@
+import numpy as np
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+class IncrementalTfidf:
+    """
+    Fixed-memory TF-IDF for corpora that don't fit in memory.
+
+    Texts are hashed into n_features columns, so there is no vocabulary to
+    grow, and document frequencies are accumulated chunk by chunk with
+    partial_fit (a first pass over the data) before finalize() turns them
+    into the same smoothed IDF weights TfidfVectorizer uses.
+    """
+    def __init__(self, n_features: int = 2 ** 20):
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+        self.document_counts = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self.transformer = None
+
+    def partial_fit(self, texts):
+        X = self.vectorizer.transform(texts)
+        X.sum_duplicates()
+        self.document_counts += np.bincount(X.indices, minlength=X.shape[1])
+        self.n_documents += X.shape[0]
+        return self
+
+    def finalize(self):
+        self.transformer = TfidfTransformer()
+        self.transformer.idf_ = np.log((1 + self.n_documents) / (1 + self.document_counts)) + 1
+        return self
+
+    def transform(self, texts):
+        return self.transformer.transform(self.vectorizer.transform(texts))
+
+    def pipeline_steps(self):
+        # For make_pipeline(*steps, classifier): plain sklearn objects, no custom class to unpickle
+        return [self.vectorizer, self.transformer]
+
+def partial_fit_chunks(estimator, chunks, transform, calibrate=False, calibration_fraction=0.05,
+                       calibration_rows=20000, random_state=0, classes=(0, 1)):
+    """
+    Trains estimator with partial_fit, one (texts, labels) chunk at a time.
+
+    transform: turns a list of texts into the estimator's feature matrix.
+    calibrate: hold back a random calibration_fraction of rows (up to
+    calibration_rows) and wrap the fitted estimator in a sigmoid
+    CalibratedClassifierCV, for losses without predict_proba such as hinge.
+    Returns the fitted classifier.
+    """
+    rng = np.random.default_rng(random_state)
+    held_texts, held_labels = [], []
+    for texts, labels in chunks:
+        texts, labels = np.asarray(texts, dtype=object), np.asarray(labels)
+        held = np.zeros(len(texts), dtype=bool)
+        if calibrate:
+            held = rng.random(len(texts)) < calibration_fraction
+            held &= np.cumsum(held) <= calibration_rows - len(held_texts)
+            held_texts.extend(texts[held])
+            held_labels.extend(labels[held])
+        if (~held).any():
+            estimator.partial_fit(transform(list(texts[~held])), labels[~held], classes=list(classes))
+
+    if not calibrate:
+        return estimator
+
+    from sklearn.frozen import FrozenEstimator
+    calibrated = CalibratedClassifierCV(FrozenEstimator(estimator), method="sigmoid")
+    return calibrated.fit(transform(held_texts), held_labels)
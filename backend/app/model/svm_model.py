@@ -1,4 +1,6 @@
-from sklearn.svm import SVC
+from sklearn.svm import SVC, LinearSVC
+from sklearn.linear_model import SGDClassifier
+from sklearn.calibration import CalibratedClassifierCV
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.pipeline import make_pipeline
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
@@ -6,14 +8,32 @@ import joblib
 import os
 from app.config import settings
 
+def build_classifier(solver: str):
+    """
+    solver: "linear" (liblinear), "sgd" (hinge-loss SGD) or "svc" (kernel SVC).
+    """
+    if solver == "svc":
+        # Exact, but super-linear in rows and runs its own 5-fold Platt scaling
+        return SVC(kernel='linear', probability=True)
+    if solver == "linear":
+        base = LinearSVC()
+    elif solver == "sgd":
+        base = SGDClassifier(loss="hinge")
+    else:
+        raise ValueError(f"Unknown SVM solver: {solver}")
+    # Sigmoid calibration on cross-validated decision values. ensemble=False
+    # keeps one linear model fitted on all rows, so it stays explainable exactly.
+    return CalibratedClassifierCV(base, method="sigmoid", cv=3, ensemble=False)
+
 class SVMModel:
-    def __init__(self):
-        self.model = make_pipeline(TfidfVectorizer(), SVC(kernel='linear', probability=True))
+    def __init__(self, solver=None):
+        self.solver = solver or settings.SVM_SOLVER
+        self.model = make_pipeline(TfidfVectorizer(), build_classifier(self.solver))
         self.model_path = os.path.join(settings.MODEL_SAVE_DIR, "svm_model.pkl")
 
     def train(self, X_train, y_train):
         self.model.fit(X_train, y_train)
-        
+
     def evaluate(self, X_test, y_test):
         y_pred = self.model.predict(X_test)
         metrics = {
@@ -0,0 +1,66 @@
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+import scipy.sparse as sp
+from sklearn.pipeline import Pipeline
+from app.config import settings
+
+class TransformCache:
+    """
+    LRU cache of vectorized texts for one fitted feature pipeline.
+
+    Repeated texts (retweets, the same text scored by another request) skip
+    tokenization; only unseen texts are vectorized, in one call. Rows are
+    kept as (indices, data) arrays and reassembled into a CSR matrix.
+    """
+    def __init__(self, transformer, max_entries: int):
+        self.transformer = transformer
+        self.max_entries = max_entries
+        self.n_features = None
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def transform(self, texts):
+        if not texts:
+            return self.transformer.transform(texts)
+        with self._lock:
+            rows = [self._rows.get(text) for text in texts]
+            for text, row in zip(texts, rows):
+                if row is not None:
+                    self._rows.move_to_end(text)
+
+        missing = list(dict.fromkeys(text for text, row in zip(texts, rows) if row is None))
+        if missing:
+            X = sp.csr_matrix(self.transformer.transform(missing))
+            self.n_features = X.shape[1]
+            new_rows = {
+                text: (X.indices[X.indptr[i]:X.indptr[i + 1]].copy(), X.data[X.indptr[i]:X.indptr[i + 1]].copy())
+                for i, text in enumerate(missing)
+            }
+            with self._lock:
+                self._rows.update(new_rows)
+                while len(self._rows) > self.max_entries:
+                    self._rows.popitem(last=False)
+            rows = [new_rows[text] if row is None else row for text, row in zip(texts, rows)]
+
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(indices) for indices, _ in rows], out=indptr[1:])
+        indices = np.concatenate([indices for indices, _ in rows])
+        data = np.concatenate([data for _, data in rows])
+        return sp.csr_matrix((data, indices, indptr), shape=(len(rows), self.n_features))
+
+# Caches per fitted pipeline, dropped with it on hot-swap
+_caches = weakref.WeakKeyDictionary()
+
+def cached_predict_proba(model, texts):
+    """
+    model.predict_proba for sklearn pipelines, with the feature steps served
+    from a TransformCache. Other models are called directly.
+    """
+    pipeline = getattr(model, "model", None)
+    if not isinstance(pipeline, Pipeline) or len(pipeline.steps) < 2 or settings.TRANSFORM_CACHE_SIZE <= 0:
+        return model.predict_proba(texts)
+    if pipeline not in _caches:
+        _caches[pipeline] = TransformCache(pipeline[:-1], settings.TRANSFORM_CACHE_SIZE)
+    return pipeline[-1].predict_proba(_caches[pipeline].transform(list(texts)))
@@ -0,0 +1,54 @@
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+PAD_ID = 0
+UNK_ID = 1
+
+class Vocabulary:
+    """
+    Word-level vocabulary for the LSTM, built from cleaned text (whitespace
+    tokens). Ids 0 and 1 are reserved for padding and unknown words.
+    """
+    def __init__(self, tokens):
+        self.tokens = list(tokens)
+        # Hash index in C, so a whole batch is looked up in one call
+        self.index = pd.Index(self.tokens)
+
+    @classmethod
+    def build(cls, texts, max_size: int, min_freq: int = 1):
+        """
+        Keeps the max_size - 2 most frequent words seen at least min_freq times.
+        """
+        counts = Counter(token for text in texts for token in text.split())
+        frequent = [token for token, count in counts.most_common(max_size - 2) if count >= min_freq]
+        return cls(frequent)
+
+    def __len__(self):
+        return len(self.tokens) + 2
+
+    def encode(self, texts, max_len: int):
+        """
+        Encodes texts to a zero-padded (n_texts, width) int32 array, keeping the
+        first max_len words of each text; width is the longest encoded text.
+        Returns (ids, lengths). Empty texts get length 1 (a single padding id)
+        so they can still be packed.
+        """
+        rows = [text.split()[:max_len] for text in texts]
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        flat = [token for row in rows for token in row]
+        # Unknown words come back as -1, which the +2 offset turns into UNK_ID
+        codes = self.index.get_indexer(flat).astype(np.int32) + 2 if flat else np.zeros(0, dtype=np.int32)
+
+        width = max(1, int(lengths.max())) if len(rows) else 1
+        ids = np.full((len(rows), width), PAD_ID, dtype=np.int32)
+        ids[np.arange(width)[None, :] < lengths[:, None]] = codes
+        return ids, np.maximum(lengths, 1)
+
+    def to_state(self) -> str:
+        # One newline-separated string: whitespace tokens never contain "\n"
+        return "\n".join(self.tokens)
+
+    @classmethod
+    def from_state(cls, state: str):
+        return cls(state.split("\n") if state else [])
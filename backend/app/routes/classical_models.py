@@ -1,29 +1,32 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from app.schemas import TrainingRequest
-# from app.model.svm_model import SVMModel
-# from app.model.rf_model import RFModel
-# from app.model.lr_model import LRModel
-import pandas as pd
-import os
-from app.config import settings
+from fastapi import APIRouter, HTTPException
+from app.schemas import TrainingRequest, ComparisonRequest
+from app.model.registry import MODEL_TYPES, HEAVY_MODELS
+from app.utils.jobs import job_engine
+from app.utils.training import run_training_job, run_comparison_job
 
 router = APIRouter()
 
-training_status = {}
-
-def train_classical_task(request: TrainingRequest, task_id: str):
-    try:
-        training_status[task_id] = "Training"
-        # Implementation similar to deep learning but with SVM/RF/LR models
-        training_status[task_id] = "Completed"
-    except Exception as e:
-        training_status[task_id] = f"Failed: {str(e)}"
-
 @router.post("/classical", response_model=dict)
-async def train_classical_model(request: TrainingRequest, background_tasks: BackgroundTasks):
+def train_classical_model(request: TrainingRequest):
     if len(request.dataset_filenames) < 3:
         raise HTTPException(status_code=400, detail="Minimum 3 datasets are required for training")
-    
-    task_id = "task_classical_" + request.model_type
-    background_tasks.add_task(train_classical_task, request, task_id)
+    if request.model_type not in MODEL_TYPES or request.model_type in HEAVY_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unsupported classical model: {request.model_type}")
+
+    # Progress and metrics are reported through /models/status/{task_id}
+    task_id = job_engine.submit(request.model_type, request.model_dump(), run_training_job, [request.model_type])
     return {"message": "Training started", "task_id": task_id}
+
+@router.post("/compare", response_model=dict)
+def train_and_compare(request: ComparisonRequest):
+    """
+    Trains SVM, RF and LR on the same split in one job; the report is served by /compare.
+    """
+    if len(request.dataset_filenames) < 3:
+        raise HTTPException(status_code=400, detail="Minimum 3 datasets are required for training")
+    unsupported = [t for t in request.model_types if t not in MODEL_TYPES or t in HEAVY_MODELS]
+    if unsupported or not request.model_types:
+        raise HTTPException(status_code=400, detail=f"Unsupported classical models: {', '.join(unsupported)}")
+
+    task_id = job_engine.submit("COMPARISON", request.model_dump(), run_comparison_job, request.model_types)
+    return {"message": "Comparison started", "task_id": task_id}
@@ -1,7 +1,13 @@
 from fastapi import APIRouter
+from app.model.registry import registry
+from app.utils.drift import drift_monitor
+from app.utils.training import load_comparison_report
 
 router = APIRouter()
 
 @router.get("/")
-def placeholder():
-    return {"message": "Placeholder"}
+def compare_models():
+    # Models currently resident in the registry, with their versions, and
+    # the latest classical comparison run (POST /classical/compare) and
+    # trained-vs-live drift of the models scoring live tweets
+    return {"models": registry.status(), "report": load_comparison_report(), "drift": drift_monitor.report()}
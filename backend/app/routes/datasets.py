@@ -0,0 +1,33 @@
+from typing import List
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from app.schemas import DatasetInfo
+from app.utils.dataset_store import dataset_store, dataset_name
+
+router = APIRouter()
+
+@router.post("/upload", response_model=DatasetInfo)
+async def upload_dataset(file: UploadFile = File(...)):
+    """
+    Ingests a CSV with text and label columns; training then reads the stored copy.
+    """
+    try:
+        # Parsing and cleaning are CPU-bound: keep them off the event loop
+        info = await run_in_threadpool(dataset_store.ingest, file.filename or "", file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DatasetInfo(**info)
+
+@router.get("/", response_model=List[DatasetInfo])
+def list_datasets():
+    return [DatasetInfo(**info) for info in dataset_store.list()]
+
+@router.get("/{filename}", response_model=DatasetInfo)
+def get_dataset(filename: str):
+    try:
+        dataset_store.ensure(filename)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return DatasetInfo(**dataset_store.info(dataset_name(filename)))
@@ -1,7 +1,52 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from app.schemas import ExplainRequest, ExplanationResponse, BatchExplainRequest, BatchExplanationResponse
+from app.utils.executor import run_explanation, run_explanations, model_version
+from app.utils.preprocess import clean_text, clean_texts
 
 router = APIRouter()
 
-@router.get("/")
-def placeholder():
-    return {"message": "Placeholder"}
+@router.post("/explain", response_model=ExplanationResponse)
+async def explain(request: ExplainRequest):
+    method = request.explainability_method.upper()
+    if method not in ("LIME", "SHAP"):
+        raise HTTPException(status_code=400, detail=f"Unknown explainability method: {request.explainability_method}")
+
+    try:
+        features = await run_explanation(request.model_type, clean_text(request.text), method, request.num_features)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"{request.model_type} model has not been trained yet")
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return ExplanationResponse(
+        method=method,
+        explanation={
+            "features": features,
+            "model_type": request.model_type,
+            "model_version": model_version(request.model_type)
+        }
+    )
+
+@router.post("/explain/batch", response_model=BatchExplanationResponse)
+async def explain_batch(request: BatchExplainRequest):
+    method = request.explainability_method.upper()
+    if method not in ("LIME", "SHAP"):
+        raise HTTPException(status_code=400, detail=f"Unknown explainability method: {request.explainability_method}")
+
+    time_budget = request.time_budget_ms / 1000 if request.time_budget_ms else None
+    try:
+        explanations = await run_explanations(
+            request.model_type, clean_texts(request.texts), method, request.num_features, time_budget
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"{request.model_type} model has not been trained yet")
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BatchExplanationResponse(
+        method=method,
+        model_type=request.model_type,
+        model_version=model_version(request.model_type),
+        explanations=explanations,
+        complete=all(features is not None for features in explanations)
+    )
@@ -1,14 +1,80 @@
-from fastapi import APIRouter, HTTPException
-from app.schemas import LiveTwitterRequest, AnalysisResult
-from app.utils.twitter_client import fetch_tweets
-# from app.model.svm_model import SVMModel
-from app.utils.preprocess import clean_text
+import json
+from datetime import datetime, timezone
+from typing import Optional
+from contextlib import aclosing
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from app.schemas import LiveTwitterRequest, AnalysisResult, TrackRequest
+from app.utils.twitter_client import twitter_client, RateLimitExceeded
+from app.utils.scoring import score_tweets
+from app.utils.tracker import tracker
+from app.utils.live_store import live_store
 
 router = APIRouter()
 
 # Global simulation of API usage
 MOCK_API_USAGE = 0
 
+# Tweets per streamed page, matching the v2 search page size
+STREAM_PAGE_SIZE = 100
+
+def generate_mock_tweets(keyword: str, count: int):
+    import random
+    from datetime import datetime, timedelta
+    
+    # Generator for diverse tweets
+    subjects = [keyword, "This AI", "The model", "It", "The system", "This tool", "The algorithm", "My experience", "The output", "The process"]
+    verbs = ["is", "seems", "looks", "feels", "performs", "behaves", "runs", "works", "acts"]
+    adj_pos = ["amazing", "incredible", "fantastic", "super fast", "accurate", "revolutionary", "game-changer", "brilliant", "helpful", "solid"]
+    adj_neg = ["terrible", "bad", "slow", "inaccurate", "confusing", "useless", "broken", "disappointing", "frustrating", "laggy"]
+    adj_neu = ["okay", "decent", "average", "standard", "fine", "nothing special", "expected", "complex", "interesting", "acceptable"]
+    contexts = ["for my project.", "in production.", "honestly.", "today.", "so far.", "surprisingly.", "to be honest.", "at scale.", "in tests."]
+    hashtags = ["#AI", "#Tech", "#ML", "#Data", "#Review", "#Testing", "#Dev", "#Coding", "#Innovation", "#BigData"]
+    
+    # User details generators
+    first_names = ["Alice", "Bob", "Charlie", "David", "Eve", "Frank", "Grace", "Liam", "Sophia", "Noah"]
+    countries = ["USA", "UK", "Canada", "Germany", "France", "Japan", "India", "Australia", "Brazil", "Unknown"]
+
+    tweets_data = []
+    limit = count if count > 0 else 100
+    
+    for i in range(limit):
+        sentiment_type = random.choices(["Positive", "Negative", "Neutral"], weights=[0.4, 0.3, 0.3])[0]
+        
+        p1 = random.choice(subjects)
+        p2 = random.choice(verbs)
+        
+        if sentiment_type == "Positive":
+            p3 = random.choice(adj_pos)
+        elif sentiment_type == "Negative":
+            p3 = random.choice(adj_neg)
+        else:
+            p3 = random.choice(adj_neu)
+            
+        p4 = random.choice(contexts)
+        tag = random.choice(hashtags)
+        
+        text = f"{p1} {p2} {p3} {p4} {tag}"
+        
+        # Generate random user details
+        username = f"@{random.choice(first_names)}{random.randint(10, 999)}"
+        user_id = str(random.randint(1000000, 9999999))
+        country = random.choices(countries, k=1)[0]
+        
+        # Add some randomness to time
+        time_offset = random.randint(0, 60)
+        created_at = datetime.now() - timedelta(seconds=time_offset)
+
+        tweets_data.append({
+            "text": text,
+            "created_at": created_at,
+            "user_id": user_id,
+            "username": username,
+            "country": country
+        })
+
+    return tweets_data
+
 @router.post("/analyze", response_model=list[AnalysisResult])
 async def analyze_live_tweets(request: LiveTwitterRequest):
     global MOCK_API_USAGE
@@ -17,9 +83,16 @@ async def analyze_live_tweets(request: LiveTwitterRequest):
     if MOCK_API_USAGE > 500:
         raise HTTPException(status_code=429, detail="Rate limit exceeded: Keys will be blocked due to excessive usage (Simulated).")
 
+    # Tracked keywords are already fetched and scored in the background
+    tracked = tracker.get(request.keyword)
+    if tracked is not None and tracked.model_type == request.model_type and tracked.results:
+        return tracked.latest(request.count if request.count > 0 else 100)
+
     # 1. Fetch tweets
     try:
-        tweets_data = fetch_tweets(request.keyword, request.count)
+        tweets_data = await twitter_client.fetch(request.keyword, request.count)
+    except RateLimitExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         print(f"Error fetching tweets: {e}")
         tweets_data = []
@@ -27,89 +100,109 @@ async def analyze_live_tweets(request: LiveTwitterRequest):
     # FALLBACK: If API fails (common with Free Tier) or returns no tweets, use Mock Data
     if not tweets_data:
         print(f"Using MOCK data. Request count: {request.count}")
-        import random
-        from datetime import datetime, timedelta
-        
-        # Generator for diverse tweets
-        subjects = [request.keyword, "This AI", "The model", "It", "The system", "This tool", "The algorithm", "My experience", "The output", "The process"]
-        verbs = ["is", "seems", "looks", "feels", "performs", "behaves", "runs", "works", "acts"]
-        adj_pos = ["amazing", "incredible", "fantastic", "super fast", "accurate", "revolutionary", "game-changer", "brilliant", "helpful", "solid"]
-        adj_neg = ["terrible", "bad", "slow", "inaccurate", "confusing", "useless", "broken", "disappointing", "frustrating", "laggy"]
-        adj_neu = ["okay", "decent", "average", "standard", "fine", "nothing special", "expected", "complex", "interesting", "acceptable"]
-        contexts = ["for my project.", "in production.", "honestly.", "today.", "so far.", "surprisingly.", "to be honest.", "at scale.", "in tests."]
-        hashtags = ["#AI", "#Tech", "#ML", "#Data", "#Review", "#Testing", "#Dev", "#Coding", "#Innovation", "#BigData"]
-        
-        # User details generators
-        first_names = ["Alice", "Bob", "Charlie", "David", "Eve", "Frank", "Grace", "Liam", "Sophia", "Noah"]
-        countries = ["USA", "UK", "Canada", "Germany", "France", "Japan", "India", "Australia", "Brazil", "Unknown"]
-
-        tweets_data = []
-        limit = request.count if request.count > 0 else 100
-        
-        for i in range(limit):
-            sentiment_type = random.choices(["Positive", "Negative", "Neutral"], weights=[0.4, 0.3, 0.3])[0]
-            
-            p1 = random.choice(subjects)
-            p2 = random.choice(verbs)
-            
-            if sentiment_type == "Positive":
-                p3 = random.choice(adj_pos)
-            elif sentiment_type == "Negative":
-                p3 = random.choice(adj_neg)
-            else:
-                p3 = random.choice(adj_neu)
-                
-            p4 = random.choice(contexts)
-            tag = random.choice(hashtags)
-            
-            text = f"{p1} {p2} {p3} {p4} {tag}"
-            
-            # Generate random user details
-            username = f"@{random.choice(first_names)}{random.randint(10, 999)}"
-            user_id = str(random.randint(1000000, 9999999))
-            country = random.choices(countries, k=1)[0]
-            
-            # Add some randomness to time
-            time_offset = random.randint(0, 60)
-            created_at = datetime.now() - timedelta(seconds=time_offset)
-
-            tweets_data.append({
-                "text": text,
-                "created_at": created_at,
-                "user_id": user_id,
-                "username": username,
-                "country": country
-            })
+        tweets_data = generate_mock_tweets(request.keyword, request.count)
 
     # Update Simulated Usage
     MOCK_API_USAGE += len(tweets_data)
 
-    # 2. Mock Model Analysis
-    results = []
-    import random
-    
-    for tweet in tweets_data:
-        text_lower = tweet['text'].lower()
-        
-        # Simple rule-based mock sentiment for consistency with the generated text
-        if any(w in text_lower for w in ["terrible", "bad", "slow", "broken", "useless", "disappointing"]):
-            sent = "Negative"
-            conf = random.uniform(0.75, 0.99)
-        elif any(w in text_lower for w in ["amazing", "incredible", "fantastic", "fast", "revolutionary", "brilliant"]):
-            sent = "Positive"
-            conf = random.uniform(0.75, 0.99)
-        else:
-            sent = random.choice(["Neutral", "Positive", "Negative"])
-            conf = random.uniform(0.55, 0.85)
-
-        results.append(AnalysisResult(
-            text=tweet['text'],
-            sentiment=sent,
-            confidence=round(conf, 4),
-            explanation=None,
-            user_id=tweet.get("user_id", "Unknown"),
-            username=tweet.get("username", "Unknown"),
-            country=tweet.get("country", "Unknown")
-        ))
-        
-    return results
+    # 2. Model Analysis
+    return await score_tweets(request.model_type, tweets_data, request.keyword)
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _stream_analysis(request: LiveTwitterRequest, http_request: Request):
+    global MOCK_API_USAGE
+
+    sent = 0
+    try:
+        # The client prefetches the next page while this one is being scored
+        async with aclosing(twitter_client.pages(request.keyword, request.count)) as pages:
+            async for page in pages:
+                if await http_request.is_disconnected():
+                    # Leaving the block closes the page stream and stops the upstream fetch
+                    return
+                MOCK_API_USAGE += len(page)
+                results = await score_tweets(request.model_type, page, request.keyword)
+                sent += len(results)
+                yield _sse("results", [r.model_dump(mode="json") for r in results])
+    except RateLimitExceeded as e:
+        yield _sse("error", {"detail": str(e)})
+        return
+    except Exception as e:
+        print(f"Error fetching tweets: {e}")
+
+    if not sent:
+        # FALLBACK: same mock data as /analyze, delivered page by page
+        print(f"Using MOCK data. Request count: {request.count}")
+        mock = generate_mock_tweets(request.keyword, request.count)
+        for i in range(0, len(mock), STREAM_PAGE_SIZE):
+            if await http_request.is_disconnected():
+                return
+            page = mock[i:i + STREAM_PAGE_SIZE]
+            MOCK_API_USAGE += len(page)
+            results = await score_tweets(request.model_type, page, request.keyword)
+            sent += len(results)
+            yield _sse("results", [r.model_dump(mode="json") for r in results])
+
+    yield _sse("done", {"count": sent})
+
+@router.post("/analyze/stream")
+async def stream_live_tweets(request: LiveTwitterRequest, http_request: Request):
+    """
+    Server-Sent Events variant of /analyze: each page of tweets is scored and
+    sent as a "results" event as soon as it is fetched, followed by "done".
+    """
+    # Simulate Rate Limit Check
+    if MOCK_API_USAGE > 500:
+        raise HTTPException(status_code=429, detail="Rate limit exceeded: Keys will be blocked due to excessive usage (Simulated).")
+
+    return StreamingResponse(
+        _stream_analysis(request, http_request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/history")
+def get_live_history(keyword: Optional[str] = None, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None, limit: int = 1000):
+    """
+    Stored scored tweets with start <= created_at < end, newest first.
+    Times without a timezone are taken as UTC.
+    """
+    def timestamp(value):
+        if value is None:
+            return None
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()
+
+    rows = live_store.query(timestamp(start), timestamp(end), keyword, limit)
+    for row in rows:
+        row["created_at"] = datetime.fromtimestamp(row["created_at"], timezone.utc).isoformat()
+        row["scored_at"] = datetime.fromtimestamp(row["scored_at"], timezone.utc).isoformat()
+    return rows
+
+@router.post("/track")
+async def track_keyword(request: TrackRequest):
+    """
+    Registers a keyword for background polling. Only new tweets are fetched
+    and scored on each poll; /analyze and /dashboard/stats read the results.
+    """
+    tracked = tracker.track(request.keyword, request.model_type)
+    return tracked.summary()
+
+@router.get("/track")
+def list_tracked_keywords():
+    return tracker.summaries()
+
+@router.get("/track/{keyword}")
+def get_tracked_keyword(keyword: str, limit: int = 100):
+    tracked = tracker.get(keyword)
+    if tracked is None:
+        raise HTTPException(status_code=404, detail=f"Keyword '{keyword}' is not tracked")
+    return {**tracked.summary(), "results": tracked.latest(limit)}
+
+@router.delete("/track/{keyword}")
+def untrack_keyword(keyword: str):
+    if not tracker.untrack(keyword):
+        raise HTTPException(status_code=404, detail=f"Keyword '{keyword}' is not tracked")
+    return {"message": f"Stopped tracking '{keyword}'"}
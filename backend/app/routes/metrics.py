@@ -1,27 +1,43 @@
 import os
 from fastapi import APIRouter
+from app.config import settings
+from app.utils.aggregator import aggregator
+from app.utils.cache import result_cache
+from app.utils.cascade import cascade_summary
+from app.utils.training import latest_training_results
 
 router = APIRouter()
 
 @router.get("/")
 def get_metrics():
     # Check if models exist (indicators of a training session)
-    models_dir = "backend/models"
-    has_models = os.path.exists(models_dir) and len(os.listdir(models_dir)) > 0
-    
-    if not has_models:
+    has_models = os.path.exists(settings.MODEL_SAVE_DIR) and len(os.listdir(settings.MODEL_SAVE_DIR)) > 0
+    results = latest_training_results() if has_models else {}
+
+    if not results:
         return {} # Empty metrics for fresh session
 
-    # Return stored metrics for visualization ONLY if models exist
+    # Held-out metrics of the best trained model
+    model_type, (_, metrics) = max(results.items(), key=lambda item: item[1][1]["f1_score"])
     return {
         "success": True,
-        "accuracy": 0.92,
-        "precision": 0.91,
-        "recall": 0.93,
-        "f1_score": 0.92,
-        "confusion_matrix": [
-             [450, 20, 30],
-             [40, 300, 60],
-             [25, 50, 500]
-        ]
+        "model_type": model_type,
+        "accuracy": metrics["accuracy"],
+        "precision": metrics["precision"],
+        "recall": metrics["recall"],
+        "f1_score": metrics["f1_score"],
+        "confusion_matrix": metrics["confusion_matrix"]
     }
+
+@router.get("/live")
+def get_live_metrics():
+    return aggregator.snapshot()
+
+@router.get("/cascade")
+def get_cascade_stats():
+    # Threshold, stages and per-stage texts/latency of CASCADE inference
+    return cascade_summary()
+
+@router.get("/cache")
+def get_cache_stats():
+    return result_cache.stats()
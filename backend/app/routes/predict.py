@@ -1,7 +1,42 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from app.config import settings
+from app.schemas import PredictionRequest, PredictionResponse
+from app.model.registry import MODEL_TYPES
+from app.utils.batcher import MicroBatcher
+from app.utils.cascade import CASCADE
+from app.utils.executor import run_inference, model_version
+from app.utils.preprocess import clean_text
 
 router = APIRouter()
 
-@router.get("/")
-def placeholder():
-    return {"message": "Placeholder"}
+# One micro-batcher per model type, created on first use
+batchers = {}
+
+def get_batcher(model_type: str) -> MicroBatcher:
+    if model_type not in batchers:
+        batchers[model_type] = MicroBatcher(
+            lambda texts: run_inference(model_type, texts),
+            max_batch_size=settings.PREDICT_MAX_BATCH_SIZE,
+            max_wait_ms=settings.PREDICT_MAX_WAIT_MS
+        )
+    return batchers[model_type]
+
+@router.post("/predict", response_model=PredictionResponse)
+async def predict(request: PredictionRequest):
+    if request.model_type not in MODEL_TYPES and request.model_type != CASCADE:
+        raise HTTPException(status_code=400, detail=f"Unknown model type: {request.model_type}")
+
+    try:
+        sentiment, confidence = await get_batcher(request.model_type).submit(clean_text(request.text))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"{request.model_type} model has not been trained yet")
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return PredictionResponse(
+        text=request.text,
+        sentiment=sentiment,
+        confidence=round(confidence, 4),
+        model_type=request.model_type,
+        model_version=model_version(request.model_type)
+    )
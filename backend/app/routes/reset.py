@@ -1,15 +1,22 @@
 import os
 import shutil
 from fastapi import APIRouter
+from app.config import settings
+from app.model.registry import registry
+from app.utils.cache import result_cache
+from app.utils.aggregator import aggregator
+from app.utils.drift import drift_monitor
+from app.utils.jobs import job_store
+from app.utils.live_store import live_store
 
 router = APIRouter()
 
 @router.post("/reset")
 def reset_system():
     paths = [
-        "backend/models",
-        "backend/data/trained",
-        "backend/data/live"
+        settings.MODEL_SAVE_DIR,
+        settings.TRAINED_DATA_DIR,
+        settings.FEATURE_STORE_DIR
     ]
 
     for path in paths:
@@ -19,4 +26,15 @@ def reset_system():
         else:
              os.makedirs(path)
 
+    # Deleted models must not keep being served from memory; pool workers
+    # unload theirs when they see version 0 (registry.ensure_version)
+    registry.clear()
+    result_cache.invalidate()
+
+    # Training history and live tweets/statistics belong to the session being reset
+    job_store.clear_finished()
+    live_store.clear()
+    aggregator.reset()
+    drift_monitor.reset()
+
     return {"status": "System reset successful"}
@@ -1,101 +1,35 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from app.schemas import TrainingRequest, ModelMetrics
-# from app.model.lstm_model import LSTMModel
-# from app.model.bert_model import BertModelWrapper
-# from app.utils.preprocess import clean_text
-import pandas as pd
-import os
-from app.config import settings
+from typing import List
+from fastapi import APIRouter, HTTPException
+from app.schemas import TrainingRequest, TrainingJob
+from app.model.registry import HEAVY_MODELS
+from app.utils.jobs import job_engine, job_store
+from app.utils.training import run_training_job
 
 router = APIRouter()
 
-# Global dictionary to store training status or results temporarily
-training_status = {}
-
-def train_model_task(request: TrainingRequest, task_id: str):
-    try:
-        training_status[task_id] = "Training"
-        # 1. Load Datasets
-        # dfs = []
-        # for filename in request.dataset_filenames:
-        #     path = os.path.join(settings.TRAINED_DATA_DIR, filename)
-        #     dfs.append(pd.read_csv(path))
-        # df = pd.concat(dfs)
-        
-        # 2. Preprocess
-        # df['cleaned_text'] = df['text'].apply(clean_text)
-        
-        # 3. Split Data
-        # X_train, X_test, y_train, y_test = train_test_split(...)
-        
-        # 4. Train Model
-        # if request.model_type == "LSTM":
-        #    model = LSTMModel()
-        # elif request.model_type == "BERT":
-        #    model = BertModelWrapper()
-        
-        # model.train(X_train, y_train)
-        # metrics = model.evaluate(X_test, y_test)
-        # model.save()
-        
-        training_status[task_id] = "Completed"
-        # Store metrics to file or DB
-        
-    except Exception as e:
-        training_status[task_id] = f"Failed: {str(e)}"
-
 @router.post("/deep-learning", response_model=dict)
 def train_deep_learning_model(request: TrainingRequest):
     if len(request.dataset_filenames) < 3:
         raise HTTPException(status_code=400, detail="Minimum 3 datasets are required for training")
-    
-    # Simulate training delay slightly if needed, or just return result
-    # For demonstration, we return mock metrics ensuring the frontend can visualize them.
-    
-    import random
-    
-    base_acc = 0.85 if request.model_type == "LSTM" else 0.92
-    noise = random.uniform(-0.02, 0.02)
-    accuracy = min(1.0, max(0.0, base_acc + noise))
-    precision = accuracy - 0.02
-    recall = accuracy - 0.01
-    f1 = 2 * (precision * recall) / (precision + recall)
-    
-    # Mock confusion matrix (3 classes: Negative, Neutral, Positive)
-    # Rows: Actual, Cols: Predicted
-    # [0][0] Act Neg, Pred Neg | [0][1] Act Neg, Pred Neu | [0][2] Act Neg, Pred Pos
-    # [1][0] Act Neu, Pred Neg | [1][1] Act Neu, Pred Neu | [1][2] Act Neu, Pred Pos
-    # [2][0] Act Pos, Pred Neg | [2][1] Act Pos, Pred Neu | [2][2] Act Pos, Pred Pos
-    
-    total_samples = 1000
-    n_classes = 3
-    
-    # Randomly distribute samples roughly evenly roughly
-    correct_preds = int(total_samples * accuracy)
-    incorrect_preds = total_samples - correct_preds
-    
-    # Diagonal (Correct)
-    per_class_correct = correct_preds // n_classes
-    
-    # Off-diagonal (Incorrect) - spread roughly
-    # We just construct a plausible matrix
-    
-    cm = [
-        [per_class_correct, int(incorrect_preds * 0.1), int(incorrect_preds * 0.1)],
-        [int(incorrect_preds * 0.15), per_class_correct, int(incorrect_preds * 0.15)],
-        [int(incorrect_preds * 0.25), int(incorrect_preds * 0.25), per_class_correct]
-    ]
-
-    metrics = {
-        "accuracy": accuracy,
-        "precision": precision,
-        "recall": recall,
-        "f1_score": f1,
-        "confusion_matrix": cm
-    }
+    if request.model_type not in HEAVY_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unsupported deep learning model: {request.model_type}")
 
-    return {"message": "Training completed successfully", "metrics": metrics}
+    task_id = job_engine.submit(request.model_type, request.model_dump(), run_training_job, [request.model_type])
+    return {"message": "Training started", "task_id": task_id}
 
-@router.get("/status/{task_id}")
+@router.get("/status/{task_id}", response_model=TrainingJob)
 def get_status(task_id: str):
-    return {"status": training_status.get(task_id, "Unknown")}
+    job = job_store.get(task_id)
+    if job is None:
+        return TrainingJob(task_id=task_id, status="Unknown")
+    return TrainingJob(**job)
+
+@router.get("/jobs", response_model=List[TrainingJob])
+def list_jobs(limit: int = 50):
+    return [TrainingJob(**job) for job in job_store.list(limit)]
+
+@router.post("/cancel/{task_id}")
+def cancel_job(task_id: str):
+    if not job_engine.cancel(task_id):
+        raise HTTPException(status_code=404, detail=f"No queued or running job {task_id}")
+    return {"message": "Cancellation requested", "task_id": task_id}
@@ -6,15 +6,54 @@ class TrainingRequest(BaseModel):
     explainability_method: str  # "LIME", "SHAP"
     split_ratio: float = 0.8  # 0.7 or 0.8
     dataset_filenames: List[str]
+    epochs: Optional[int] = None  # LSTM/BERT only, model default if unset
+    streaming: bool = False  # LR/SVM only: chunked, fixed-memory training for huge corpora
+
+class ComparisonRequest(BaseModel):
+    dataset_filenames: List[str]
+    split_ratio: float = 0.8
+    model_types: List[str] = ["SVM", "RF", "LR"]
+
+class TrainingJob(BaseModel):
+    task_id: str
+    status: str  # "Queued", "Training", "Completed", "Cancelled", "Failed", "Unknown"
+    model_type: Optional[str] = None
+    progress: float = 0.0  # Fraction of epochs done
+    epoch: int = 0
+    total_epochs: Optional[int] = None
+    eta_seconds: Optional[float] = None
+    metrics: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    created_at: Optional[float] = None
+    started_at: Optional[float] = None
+    updated_at: Optional[float] = None
 
 class PredictionRequest(BaseModel):
+    text: str
+    model_type: str  # One of the trained types, or "CASCADE"
+
+class PredictionResponse(BaseModel):
+    text: str
+    sentiment: str
+    confidence: float
+    model_type: str
+    model_version: int
+
+class ExplainRequest(BaseModel):
     text: str
     model_type: str
+    explainability_method: str = "LIME"  # "LIME", "SHAP"
+    num_features: int = 10
 
 class DatasetInfo(BaseModel):
     filename: str
     row_count: int
     columns: List[str]
+    content_hash: Optional[str] = None  # sha256 of the uploaded CSV
+    label_counts: Dict[str, int] = {}
+    source: Optional[str] = None  # Original upload filename
+    size_bytes: Optional[int] = None  # Parquet file size
 
 class ModelMetrics(BaseModel):
     accuracy: float
@@ -27,6 +66,20 @@ class ExplanationResponse(BaseModel):
     method: str
     explanation: Dict[str, Any]  # Structure depends on LIME/SHAP output
 
+class BatchExplainRequest(BaseModel):
+    texts: List[str]
+    model_type: str
+    explainability_method: str = "LIME"  # "LIME", "SHAP"
+    num_features: int = 10
+    time_budget_ms: Optional[int] = None  # Trade explanation precision for latency
+
+class BatchExplanationResponse(BaseModel):
+    method: str
+    model_type: str
+    model_version: int
+    explanations: List[Optional[List[Any]]]  # One [(token, weight), ...] list per text, None if out of time budget
+    complete: bool = True
+
 class AnalysisResult(BaseModel):
     text: str
     sentiment: str
@@ -36,8 +89,12 @@ class AnalysisResult(BaseModel):
     username: str
     country: str
 
+class TrackRequest(BaseModel):
+    keyword: str
+    model_type: str
+
 class LiveTwitterRequest(BaseModel):
     keyword: str
     count: int = 100
-    model_type: str
+    model_type: str  # One of the trained types, or "CASCADE"
     explainability_method: str
@@ -0,0 +1,219 @@
+import heapq
+import math
+import threading
+import time
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+from app.config import settings
+
+SENTIMENTS = ["Negative", "Neutral", "Positive"]
+SENTIMENT_IDS = {name: i for i, name in enumerate(SENTIMENTS)}
+WINDOWS = {"1m": 60, "5m": 300, "1h": 3600}
+OTHER = "Other"
+
+class SlidingWindowCounter:
+    """
+    Sentiment counts and confidence sums in a ring of fixed-width time buckets.
+
+    The ring covers the longest window; a bucket is cleared when the ring
+    wraps around to it, so adding is O(1) and reading a window sums only
+    the buckets it spans.
+    """
+    def __init__(self, horizon_seconds: int, bucket_seconds: int):
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = math.ceil(horizon_seconds / bucket_seconds) + 1
+        self.counts = np.zeros((self.n_buckets, len(SENTIMENTS)), dtype=np.int64)
+        self.confidence = np.zeros((self.n_buckets, len(SENTIMENTS)), dtype=np.float64)
+        self.head = None  # Absolute index of the newest bucket
+        self.total = 0
+
+    def _advance(self, bucket):
+        if self.head is None:
+            self.head = bucket
+        elif bucket > self.head:
+            stale = min(bucket - self.head, self.n_buckets)
+            cleared = (np.arange(1, stale + 1) + self.head) % self.n_buckets
+            self.counts[cleared] = 0
+            self.confidence[cleared] = 0.0
+            self.head = bucket
+
+    def add(self, timestamp, sentiment_ids, confidences):
+        bucket = int(timestamp // self.bucket_seconds)
+        self._advance(bucket)
+        if bucket <= self.head - self.n_buckets:
+            return
+        np.add.at(self.counts[bucket % self.n_buckets], sentiment_ids, 1)
+        np.add.at(self.confidence[bucket % self.n_buckets], sentiment_ids, confidences)
+        self.total += len(sentiment_ids)
+
+    def window(self, seconds, now):
+        self._advance(int(now // self.bucket_seconds))
+        span = min(math.ceil(seconds / self.bucket_seconds), self.n_buckets)
+        rows = (self.head - np.arange(span)) % self.n_buckets
+        counts = self.counts[rows].sum(axis=0)
+        confidence = self.confidence[rows].sum(axis=0)
+        n = int(counts.sum())
+        return {
+            "count": n,
+            "sentiment_counts": {name: int(count) for name, count in zip(SENTIMENTS, counts)},
+            "mean_confidence": round(float(confidence.sum() / n), 4) if n else None,
+            "rate_per_minute": round(n * 60 / seconds, 2)
+        }
+
+class CountMinSketch:
+    """
+    Approximate token counts in fixed memory: depth rows of width counters,
+    each token hashed once per row; the estimate is the row minimum.
+    """
+    def __init__(self, width: int, depth: int, seed: int = 0):
+        self.width = width
+        rng = np.random.default_rng(seed)
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        # Odd multipliers for multiply-shift hashing of the 64-bit token hashes
+        self.multipliers = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64) | np.uint64(1)
+
+    def _columns(self, tokens):
+        hashes = np.array([hash(token) for token in tokens], dtype=np.int64).view(np.uint64)
+        with np.errstate(over="ignore"):
+            mixed = hashes[None, :] * self.multipliers[:, None]
+        return (mixed >> np.uint64(32)) % np.uint64(self.width)
+
+    def add(self, tokens):
+        """
+        Counts tokens and returns their updated estimates.
+        """
+        if not tokens:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(tokens)
+        for row in range(len(self.table)):
+            np.add.at(self.table[row], columns[row], 1)
+        return self.table[np.arange(len(self.table))[:, None], columns].min(axis=0)
+
+class HeavyHitters:
+    """
+    Most frequent tokens: a count-min sketch for the counts plus a bounded
+    set of candidates, the token with the smallest estimate being replaced
+    when a more frequent one shows up.
+    """
+    def __init__(self, capacity: int, width: int, depth: int):
+        self.capacity = capacity
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}
+
+    def add(self, tokens):
+        estimates = self.sketch.add(tokens)
+        for token, estimate in zip(tokens, estimates):
+            self.candidates[token] = int(estimate)
+        if len(self.candidates) > self.capacity:
+            keep = heapq.nlargest(self.capacity, self.candidates.items(), key=lambda item: item[1])
+            self.candidates = dict(keep)
+
+    def top(self, k: int):
+        return [
+            {"token": token, "count": count}
+            for token, count in heapq.nlargest(k, self.candidates.items(), key=lambda item: item[1])
+        ]
+
+def _tokens(cleaned_texts):
+    return [token for text in cleaned_texts for token in text.split()
+            if len(token) > 1 and token not in ENGLISH_STOP_WORDS]
+
+class SentimentAggregator:
+    """
+    Live sentiment statistics for the dashboard, updated by every scored
+    batch of tweets.
+
+    Sentiment counts, mean confidence and rate are kept per keyword, country
+    and model in sliding windows (WINDOWS); top tokens per keyword and
+    overall come from heavy-hitter sketches. Memory is fixed: each dimension
+    keeps at most settings.AGGREGATION_MAX_SERIES values, later ones are
+    counted under "Other".
+    """
+    DIMENSIONS = ("keyword", "country", "model")
+
+    def __init__(self, max_series: int, bucket_seconds: int, top_tokens: int):
+        self.max_series = max_series
+        self.bucket_seconds = bucket_seconds
+        self.top_tokens = top_tokens
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.overall = self._counter()
+            self.series = {dimension: {} for dimension in self.DIMENSIONS}
+            self.tokens = self._heavy_hitters()
+            self.keyword_tokens = {}
+
+    def _counter(self):
+        return SlidingWindowCounter(max(WINDOWS.values()), self.bucket_seconds)
+
+    def _heavy_hitters(self):
+        return HeavyHitters(self.top_tokens * 4, settings.AGGREGATION_SKETCH_WIDTH, settings.AGGREGATION_SKETCH_DEPTH)
+
+    def _series(self, dimension, value):
+        series = self.series[dimension]
+        if value not in series and len(series) >= self.max_series:
+            value = OTHER
+        if value not in series:
+            series[value] = self._counter()
+        return series[value]
+
+    def add(self, results, keyword: str = None, model_type: str = None, cleaned_texts=None, timestamp: float = None):
+        """
+        Records a batch of AnalysisResult items scored for keyword with model_type.
+        cleaned_texts: the texts the model saw, used for the top tokens.
+        """
+        if not results:
+            return
+        timestamp = timestamp or time.time()
+        # Labels outside SENTIMENTS (none today) are counted as neutral
+        sentiment_ids = np.array([SENTIMENT_IDS.get(r.sentiment, SENTIMENT_IDS["Neutral"]) for r in results])
+        confidences = np.array([r.confidence for r in results], dtype=np.float64)
+        tokens = _tokens(cleaned_texts) if cleaned_texts is not None else []
+
+        with self._lock:
+            self.overall.add(timestamp, sentiment_ids, confidences)
+            for dimension, value in (("keyword", keyword), ("model", model_type)):
+                if value is not None:
+                    self._series(dimension, value).add(timestamp, sentiment_ids, confidences)
+            countries = np.array([r.country or "Unknown" for r in results])
+            for country in np.unique(countries):
+                mask = countries == country
+                self._series("country", str(country)).add(timestamp, sentiment_ids[mask], confidences[mask])
+
+            self.tokens.add(tokens)
+            if keyword is not None:
+                if keyword not in self.keyword_tokens and len(self.keyword_tokens) >= self.max_series:
+                    return
+                self.keyword_tokens.setdefault(keyword, self._heavy_hitters()).add(tokens)
+
+    def snapshot(self, window: str = None):
+        """
+        Current statistics; window ("1m", "5m", "1h") limits the output to one window.
+        """
+        windows = {window: WINDOWS[window]} if window else WINDOWS
+        now = time.time()
+
+        def read(counter):
+            return {name: counter.window(seconds, now) for name, seconds in windows.items()}
+
+        with self._lock:
+            return {
+                "since": self.started_at,
+                "total_scored": self.overall.total,
+                "overall": read(self.overall),
+                **{
+                    dimension: {value: read(counter) for value, counter in self.series[dimension].items()}
+                    for dimension in self.DIMENSIONS
+                },
+                "top_tokens": self.tokens.top(self.top_tokens),
+                "keyword_top_tokens": {
+                    keyword: hitters.top(self.top_tokens) for keyword, hitters in self.keyword_tokens.items()
+                }
+            }
+
+aggregator = SentimentAggregator(
+    settings.AGGREGATION_MAX_SERIES, settings.AGGREGATION_BUCKET_SECONDS, settings.AGGREGATION_TOP_TOKENS
+)
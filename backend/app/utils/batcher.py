@@ -0,0 +1,73 @@
+import asyncio
+import inspect
+
+class MicroBatcher:
+    """
+    Gathers concurrent single-item requests into batches.
+
+    Callers await submit(item). The first queued item opens a batch which is
+    closed once it holds max_batch_size items or max_wait_ms has passed, then
+    score_fn is called once with the whole list and each caller gets its own
+    result back. score_fn must return one result per input, in order, and may
+    be a coroutine function (e.g. one that offloads to a worker pool), in
+    which case several batches can be in flight at once.
+    """
+    def __init__(self, score_fn, max_batch_size=64, max_wait_ms=5.0):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._worker = None
+        self._loop = None
+        self._in_flight = set()
+
+    async def submit(self, item):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # (Re)start the worker on the current event loop
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Callers that gave up while waiting don't need scoring
+            batch = [(item, future) for item, future in batch if not future.cancelled()]
+            if batch:
+                # Keep a reference so the task isn't garbage collected mid-flight
+                task = self._loop.create_task(self._score(batch))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+    async def _score(self, batch):
+        try:
+            results = self.score_fn([item for item, _ in batch])
+            if inspect.isawaitable(results):
+                results = await results
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
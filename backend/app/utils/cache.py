@@ -0,0 +1,104 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from app.config import settings
+
+MISS = object()
+
+class ResultCache:
+    """
+    LRU cache with a TTL for predictions and explanations.
+
+    Keys are (cleaned_text, model_type, model_version, method) tuples, so a
+    retrained model never reads results of the previous version; those
+    entries are also dropped as soon as a new version is seen.
+    """
+    def __init__(self, max_entries: int, ttl_seconds: float, path: str = ""):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.time():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return MISS
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def check_version(self, model_type: str, version: int):
+        """
+        Drops every entry of model_type when its version changes (retraining).
+        """
+        with self._lock:
+            previous = self._versions.get(model_type)
+            self._versions[model_type] = version
+        if previous is not None and previous != version:
+            self.invalidate(model_type)
+
+    def invalidate(self, model_type: str = None):
+        with self._lock:
+            if model_type is None:
+                self._data.clear()
+                return
+            for key in [k for k in self._data if k[1] == model_type]:
+                del self._data[key]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            items = list(self._data.items())
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(items, f)
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                items = pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable result cache {self.path}: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            for key, (expires_at, value) in items[-self.max_entries:]:
+                if expires_at > now:
+                    self._data[key] = (expires_at, value)
+
+result_cache = ResultCache(
+    settings.RESULT_CACHE_SIZE,
+    settings.RESULT_CACHE_TTL_SECONDS,
+    settings.RESULT_CACHE_PATH
+)
@@ -0,0 +1,115 @@
+import json
+import os
+import threading
+import time
+from app.config import settings
+
+CASCADE = "CASCADE"
+CASCADE_CONFIG_PATH = os.path.join(settings.MODEL_SAVE_DIR, "cascade.json")
+
+def margin(confidence: float) -> float:
+    # Binary sentiment: P(top) - P(other)
+    return 2 * confidence - 1
+
+_config_cache = (None, None)  # (file mtime, config)
+
+def load_cascade_config():
+    """
+    Stages and threshold picked by scripts.tune_cascade, or the settings defaults.
+    """
+    global _config_cache
+    mtime = os.path.getmtime(CASCADE_CONFIG_PATH) if os.path.exists(CASCADE_CONFIG_PATH) else None
+    if _config_cache[1] is not None and _config_cache[0] == mtime:
+        return _config_cache[1]
+
+    config = {
+        "fast_model": settings.CASCADE_FAST_MODEL,
+        "slow_model": settings.CASCADE_SLOW_MODEL,
+        "threshold": settings.CASCADE_MARGIN_THRESHOLD,
+        "tuned": False
+    }
+    if mtime is not None:
+        with open(CASCADE_CONFIG_PATH) as f:
+            config.update({**json.load(f), "tuned": True})
+    _config_cache = (mtime, config)
+    return config
+
+class CascadeStats:
+    """
+    Texts and wall time per stage, since startup.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.stages = {
+            "fast": {"texts": 0, "seconds": 0.0},
+            "slow": {"texts": 0, "seconds": 0.0},
+        }
+        self.slow_errors = 0
+
+    def record(self, stage: str, texts: int, seconds: float):
+        with self._lock:
+            self.stages[stage]["texts"] += texts
+            self.stages[stage]["seconds"] += seconds
+
+    def record_batch(self):
+        with self._lock:
+            self.batches += 1
+
+    def record_slow_error(self):
+        with self._lock:
+            self.slow_errors += 1
+
+    def summary(self):
+        with self._lock:
+            fast, slow = self.stages["fast"]["texts"], self.stages["slow"]["texts"]
+            return {
+                "batches": self.batches,
+                "slow_errors": self.slow_errors,
+                "slow_fraction": round(slow / fast, 4) if fast else None,
+                "stages": {
+                    stage: {
+                        "texts": values["texts"],
+                        "seconds": round(values["seconds"], 4),
+                        "ms_per_text": round(values["seconds"] * 1000 / values["texts"], 4) if values["texts"] else None
+                    }
+                    for stage, values in self.stages.items()
+                }
+            }
+
+cascade_stats = CascadeStats()
+
+async def run_cascade(texts):
+    """
+    Scores cleaned texts with the fast model and re-scores only those whose
+    margin is below the threshold with the slow model.
+    Returns a list of (sentiment, confidence) tuples like run_inference.
+
+    If the slow model is unavailable (not trained yet, pool saturated) the
+    fast predictions are kept.
+    """
+    from app.utils.executor import run_inference, PoolSaturated
+
+    config = load_cascade_config()
+    start = time.perf_counter()
+    predictions = list(await run_inference(config["fast_model"], texts))
+    cascade_stats.record("fast", len(texts), time.perf_counter() - start)
+    cascade_stats.record_batch()
+
+    uncertain = [i for i, (_, confidence) in enumerate(predictions) if margin(confidence) < config["threshold"]]
+    if uncertain:
+        start = time.perf_counter()
+        try:
+            slow = await run_inference(config["slow_model"], [texts[i] for i in uncertain])
+        except (FileNotFoundError, PoolSaturated) as e:
+            print(f"Cascade keeps {config['fast_model']} predictions: {e}")
+            cascade_stats.record_slow_error()
+        else:
+            for i, prediction in zip(uncertain, slow):
+                predictions[i] = prediction
+            cascade_stats.record("slow", len(uncertain), time.perf_counter() - start)
+    return predictions
+
+def cascade_summary():
+    config = load_cascade_config()
+    return {**config, **cascade_stats.summary()}
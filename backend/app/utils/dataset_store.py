@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from app.config import settings
+from app.model.registry import SENTIMENT_NAMES
+from app.utils.preprocess import clean_texts
+
+LABEL_IDS = {name.lower(): label for label, name in SENTIMENT_NAMES.items()}
+METADATA_KEY = "dataset"
+SCHEMA = pa.schema([("text", pa.string()), ("cleaned_text", pa.string()), ("label", pa.int8())])
+
+def parse_labels(labels):
+    """
+    Maps a label column (0/1 or "negative"/"positive") to ints, rejecting anything else.
+    """
+    labels = pd.to_numeric(labels.map(
+        lambda label: LABEL_IDS.get(label.strip().lower(), label) if isinstance(label, str) else label
+    ), errors="coerce")
+    if labels.isna().any() or not labels.isin([0, 1]).all():
+        raise ValueError("Labels must be 0/1 or negative/positive")
+    return labels.astype("int8")
+
+def dataset_name(filename: str) -> str:
+    """
+    Store key for an upload or training request: "tweets.csv", "tweets" and
+    "tweets.parquet" all refer to the same dataset.
+    """
+    if os.path.basename(filename) != filename or not filename.strip("."):
+        raise ValueError(f"Invalid dataset filename: {filename}")
+    stem, ext = os.path.splitext(filename)
+    return stem if ext.lower() in (".csv", ".parquet") else filename
+
+class DatasetStore:
+    """
+    Training datasets ingested once into Parquet under settings.TRAINED_DATA_DIR.
+
+    Each <name>.parquet holds the raw text, a precomputed cleaned_text column
+    and the int label, with the content hash and metadata (row count, label
+    distribution, columns) in the file footer, so listing never reads rows
+    and training never parses CSV or re-cleans text. Reads are memory-mapped.
+    CSVs dropped into the directory by hand are ingested on first use, and
+    again whenever they change.
+    """
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _parquet_path(self, name):
+        return os.path.join(self.root, f"{name}.parquet")
+
+    def ingest(self, filename: str, source) -> dict:
+        """
+        Converts a CSV (text and label columns) into the store, chunk by
+        chunk so large uploads never have to fit in memory.
+        source: path or seekable binary file. Re-ingesting identical content is a no-op.
+        """
+        name = dataset_name(filename)
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                return self.ingest(filename, f)
+
+        digest = hashlib.sha256()
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+        content_hash = digest.hexdigest()
+        info = self.info(name)
+        if info is not None and info["content_hash"] == content_hash:
+            return info
+        source.seek(0)
+
+        path = self._parquet_path(name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        label_counts = pd.Series(0, index=list(SENTIMENT_NAMES), dtype="int64")
+        writer = None
+        try:
+            for chunk in pd.read_csv(source, chunksize=settings.TRAINING_CHUNK_ROWS):
+                missing = {"text", "label"} - set(chunk.columns)
+                if missing:
+                    raise ValueError(f"{filename} is missing columns: {', '.join(sorted(missing))}")
+                chunk = chunk[["text", "label"]].dropna()
+                df = pd.DataFrame({
+                    "text": chunk["text"].astype(str),
+                    "cleaned_text": clean_texts(chunk["text"]),
+                    "label": parse_labels(chunk["label"])
+                })
+                df = df[df["cleaned_text"] != ""]
+                label_counts = label_counts.add(df["label"].value_counts(), fill_value=0)
+                table = pa.Table.from_pandas(df, schema=SCHEMA, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, SCHEMA, compression="zstd")
+                writer.write_table(table)
+            if writer is None:
+                raise ValueError(f"{filename} is empty")
+
+            # Stored in the footer: listing and DatasetInfo never read any rows
+            writer.add_key_value_metadata({METADATA_KEY: json.dumps({
+                "source": filename,
+                "content_hash": content_hash,
+                "label_counts": {SENTIMENT_NAMES[label]: int(count) for label, count in label_counts.items()},
+                "ingested_at": time.time()
+            })})
+            writer.close()
+            writer = None
+            os.replace(tmp_path, path)
+        finally:
+            if writer is not None:
+                writer.close()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return self.info(name)
+
+    def _ingest_csv(self, name):
+        # A raw CSV next to the store: (re)ingest it if it is new or changed since
+        csv_path = os.path.join(self.root, f"{name}.csv")
+        if not os.path.exists(csv_path):
+            return
+        path = self._parquet_path(name)
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(csv_path):
+            return
+        self.ingest(f"{name}.csv", csv_path)
+
+    def ensure(self, filename: str) -> str:
+        """
+        Returns the Parquet path for a dataset, ingesting a raw CSV first if needed.
+        """
+        name = dataset_name(filename)
+        with self._lock:
+            self._ingest_csv(name)
+        path = self._parquet_path(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Dataset not found: {filename}")
+        return path
+
+    def info(self, name: str):
+        path = self._parquet_path(name)
+        if not os.path.exists(path):
+            return None
+        parquet_metadata = pq.read_metadata(path)
+        metadata = json.loads((parquet_metadata.metadata or {}).get(METADATA_KEY.encode(), b"{}"))
+        return {
+            "filename": name,
+            "row_count": parquet_metadata.num_rows,
+            "columns": parquet_metadata.schema.names,
+            "content_hash": metadata.get("content_hash"),
+            "label_counts": metadata.get("label_counts", {}),
+            "source": metadata.get("source"),
+            "size_bytes": os.path.getsize(path)
+        }
+
+    def list(self):
+        with self._lock:
+            for entry in sorted(os.listdir(self.root)):
+                if entry.endswith(".csv"):
+                    self._ingest_csv(entry[:-len(".csv")])
+        names = sorted(entry[:-len(".parquet")] for entry in os.listdir(self.root) if entry.endswith(".parquet"))
+        return [self.info(name) for name in names]
+
+    def read(self, filename: str, columns=("cleaned_text", "label")):
+        """
+        Loads the given columns of a dataset as a DataFrame (memory-mapped read).
+        """
+        return pq.read_table(self.ensure(filename), columns=list(columns), memory_map=True).to_pandas()
+
+    def iter_batches(self, filename: str, batch_rows: int, columns=("cleaned_text", "label")):
+        """
+        Streams a dataset as DataFrames of up to batch_rows rows.
+        """
+        parquet_file = pq.ParquetFile(self.ensure(filename), memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=batch_rows, columns=list(columns)):
+            yield batch.to_pandas()
+
+dataset_store = DatasetStore(settings.TRAINED_DATA_DIR)
@@ -0,0 +1,237 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+import numpy as np
+from app.config import settings
+from app.model.registry import artifact_version, build_model, MODEL_TYPES
+from app.utils.aggregator import WINDOWS
+
+PROBABILITY_EDGES = np.linspace(0.1, 0.9, 9)  # Ten equal-width bins over P(Positive)
+# Smoothing for empty bins, so PSI/KL stay finite
+EPSILON = 1e-4
+
+def reference_path(model_path: str) -> str:
+    return model_path.rstrip(os.sep) + ".drift.json"
+
+def _binned(values, edges, n_bins):
+    return np.bincount(np.searchsorted(edges, values, side="right"), minlength=n_bins)
+
+class DriftReference:
+    """
+    Training-time distributions of one model version: P(Positive) over
+    fixed bins, text length (tokens) over quantile bins of the reference
+    set, and term frequencies over its most frequent terms plus an "other"
+    bin. histograms() bins any batch the same way, so live batches are
+    reduced to bin counts and never stored.
+    """
+    FEATURES = ("probability", "length", "terms")
+
+    def __init__(self, state: dict):
+        self.state = state
+        self.model_version = state["model_version"]
+        self.length_edges = np.asarray(state["length"]["edges"])
+        self.vocabulary = state["terms"]["vocabulary"]
+        self.term_ids = {term: i for i, term in enumerate(self.vocabulary)}
+        self.sizes = {
+            "probability": len(PROBABILITY_EDGES) + 1,
+            "length": len(self.length_edges) + 1,
+            "terms": len(self.vocabulary) + 1
+        }
+        self.expected = {feature: np.asarray(state[feature]["counts"], dtype=np.float64) for feature in self.FEATURES}
+
+    @classmethod
+    def build(cls, texts, positive_proba, model_version: int, max_terms: int):
+        term_counts = Counter(token for text in texts for token in text.split())
+        lengths = np.array([len(text.split()) for text in texts])
+        state = {
+            "model_version": model_version,
+            "created_at": time.time(),
+            "rows": len(texts),
+            "probability": {"counts": []},
+            "length": {"edges": np.unique(np.quantile(lengths, np.linspace(0.1, 0.9, 9))).tolist() if len(texts) else [], "counts": []},
+            "terms": {"vocabulary": [term for term, _ in term_counts.most_common(max_terms)], "counts": []}
+        }
+        counts = cls(state).histograms(texts, positive_proba)
+        for feature in cls.FEATURES:
+            state[feature]["counts"] = counts[feature].tolist()
+        return cls(state)
+
+    def histograms(self, texts, positive_proba):
+        """
+        Bin counts of a batch of cleaned texts and their P(Positive).
+        """
+        other = len(self.vocabulary)
+        term_ids = [self.term_ids.get(token, other) for text in texts for token in text.split()]
+        return {
+            "probability": _binned(np.asarray(positive_proba, dtype=np.float64), PROBABILITY_EDGES, self.sizes["probability"]),
+            "length": _binned(np.array([len(text.split()) for text in texts]), self.length_edges, self.sizes["length"]),
+            "terms": np.bincount(np.asarray(term_ids, dtype=np.int64), minlength=self.sizes["terms"])
+        }
+
+def save_reference(model_path: str, texts, positive_proba, max_terms: int = None):
+    """
+    Snapshots the reference distributions of a just saved model, computed on
+    its held-out texts and their P(Positive), next to the model artifact.
+    """
+    reference = DriftReference.build(
+        list(texts), positive_proba, artifact_version(model_path), max_terms or settings.DRIFT_REFERENCE_TERMS
+    )
+    path = reference_path(model_path)
+    with open(path + ".tmp", "w") as f:
+        json.dump(reference.state, f)
+    os.replace(path + ".tmp", path)
+    return reference
+
+def snapshot_reference(model, texts, max_rows: int = None):
+    """
+    save_reference for a trained wrapper, scoring up to max_rows of its
+    (already shuffled) test texts.
+    """
+    from app.model.registry import class_labels
+
+    texts = list(texts)[:max_rows or settings.DRIFT_REFERENCE_ROWS]
+    if not texts:
+        return None
+    proba = np.asarray(model.predict_proba(texts))
+    return save_reference(model.model_path, texts, proba[:, class_labels(model).index("Positive")])
+
+def load_reference(model_path: str, model_version: int):
+    """
+    The reference of model_version, or None if there is none for that version.
+    """
+    path = reference_path(model_path)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        state = json.load(f)
+    return DriftReference(state) if state.get("model_version") == model_version else None
+
+def population_stability(expected, actual):
+    """
+    PSI and KL(actual || expected) between two histograms of counts.
+    """
+    p = np.maximum(np.asarray(expected, dtype=np.float64) / max(np.sum(expected), 1), EPSILON)
+    q = np.maximum(np.asarray(actual, dtype=np.float64) / max(np.sum(actual), 1), EPSILON)
+    p, q = p / p.sum(), q / q.sum()
+    return float(np.sum((q - p) * np.log(q / p))), float(np.sum(q * np.log(q / p)))
+
+def drift_level(psi: float) -> str:
+    # Usual PSI reading: < 0.1 no significant change, 0.1-0.25 moderate, above that major
+    if psi < settings.DRIFT_PSI_MODERATE:
+        return "stable"
+    return "moderate" if psi < settings.DRIFT_PSI_MAJOR else "major"
+
+class ModelDrift:
+    """
+    Live bin counts of one model version in a ring of time buckets covering
+    the longest window, same layout as the sentiment aggregator's.
+    """
+    def __init__(self, reference: DriftReference, horizon_seconds: int, bucket_seconds: int):
+        self.reference = reference
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = math.ceil(horizon_seconds / bucket_seconds) + 1
+        self.offsets = np.cumsum([0] + [reference.sizes[f] for f in DriftReference.FEATURES])
+        self.counts = np.zeros((self.n_buckets, self.offsets[-1]), dtype=np.int64)
+        self.rows = np.zeros(self.n_buckets, dtype=np.int64)
+        self.head = None
+
+    def _advance(self, bucket):
+        if self.head is None:
+            self.head = bucket
+        elif bucket > self.head:
+            stale = min(bucket - self.head, self.n_buckets)
+            cleared = (np.arange(1, stale + 1) + self.head) % self.n_buckets
+            self.counts[cleared] = 0
+            self.rows[cleared] = 0
+            self.head = bucket
+
+    def add(self, timestamp, texts, positive_proba):
+        histograms = self.reference.histograms(texts, positive_proba)
+        self._advance(int(timestamp // self.bucket_seconds))
+        row = self.head % self.n_buckets
+        self.counts[row] += np.concatenate([histograms[f] for f in DriftReference.FEATURES])
+        self.rows[row] += len(texts)
+
+    def window(self, seconds, now):
+        self._advance(int(now // self.bucket_seconds))
+        span = min(math.ceil(seconds / self.bucket_seconds), self.n_buckets)
+        buckets = (self.head - np.arange(span)) % self.n_buckets
+        counts = self.counts[buckets].sum(axis=0)
+        rows = int(self.rows[buckets].sum())
+        features = {}
+        for i, feature in enumerate(DriftReference.FEATURES):
+            actual = counts[self.offsets[i]:self.offsets[i + 1]]
+            if rows < settings.DRIFT_MIN_ROWS:
+                features[feature] = None
+                continue
+            psi, kl = population_stability(self.reference.expected[feature], actual)
+            features[feature] = {"psi": round(psi, 4), "kl": round(kl, 4), "level": drift_level(psi)}
+        return {"rows": rows, "features": features}
+
+class DriftMonitor:
+    """
+    Trained-vs-live drift per model, updated on every scored live batch.
+
+    Each batch is reduced to bin counts against the model version's
+    reference snapshot (save_reference, written at training time) and added
+    to a time-bucket ring, so the cost per batch is one pass over its tokens
+    and reads are O(window). A new model version starts from a fresh ring.
+    """
+    def __init__(self, bucket_seconds: int):
+        self.bucket_seconds = bucket_seconds
+        self._models = {}  # model_type -> (model_version, ModelDrift or None)
+        self._model_paths = {}
+        self._reference_versions = {}  # model_type -> reference file version when last loaded
+        self._lock = threading.Lock()
+
+    def _drift(self, model_type, model_version):
+        version, drift = self._models.get(model_type, (None, None))
+        if version != model_version or drift is None:
+            if model_type not in self._model_paths:
+                self._model_paths[model_type] = build_model(model_type).model_path
+            path = self._model_paths[model_type]
+            # Training saves the model before its reference, so a missing one
+            # is looked up again once the reference file changes
+            reference_version = artifact_version(reference_path(path))
+            if version == model_version and self._reference_versions.get(model_type) == reference_version:
+                return None
+            self._reference_versions[model_type] = reference_version
+            reference = load_reference(path, model_version)
+            drift = ModelDrift(reference, max(WINDOWS.values()), self.bucket_seconds) if reference else None
+            self._models[model_type] = (model_version, drift)
+        return drift
+
+    def observe(self, model_type: str, model_version: int, texts, predictions):
+        """
+        Records cleaned texts with their (sentiment, confidence) predictions.
+        """
+        if not model_version or not texts or model_type not in MODEL_TYPES:
+            # Cascade results mix two models, each with its own reference
+            return
+        positive = [confidence if sentiment == "Positive" else 1 - confidence for sentiment, confidence in predictions]
+        with self._lock:
+            drift = self._drift(model_type, model_version)
+            if drift is not None:
+                drift.add(time.time(), texts, positive)
+
+    def report(self):
+        now = time.time()
+        with self._lock:
+            return {
+                model_type: {
+                    "model_version": version,
+                    "reference_rows": drift.reference.state["rows"] if drift else None,
+                    "windows": {name: drift.window(seconds, now) for name, seconds in WINDOWS.items()} if drift else None
+                }
+                for model_type, (version, drift) in self._models.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._models = {}
+            self._reference_versions = {}
+
+drift_monitor = DriftMonitor(settings.DRIFT_BUCKET_SECONDS)
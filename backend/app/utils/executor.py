@@ -0,0 +1,181 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from app.config import settings
+from app.model.registry import registry, build_model, artifact_version, predict_sentiments, HEAVY_MODELS
+from app.utils.cache import result_cache, MISS
+from app.utils.cascade import CASCADE, run_cascade, load_cascade_config
+
+class PoolSaturated(Exception):
+    """
+    Raised when a worker pool already has its maximum number of pending jobs.
+    Mapped to a 503 response in app.main.
+    """
+    pass
+
+class WorkerPool:
+    """
+    Runs blocking calls off the event loop with a bound on pending jobs.
+
+    kind: "thread" for work that releases the GIL (torch ops, I/O) or
+          "process" for GIL-bound work (sklearn pipelines, LIME).
+    """
+    def __init__(self, kind: str, max_workers: int, max_queue: int):
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.pending = 0
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                # spawn: forking a process that already runs torch/uvicorn threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        # Only touched from the event loop thread, so a plain counter is enough
+        if self.pending >= self.max_pending:
+            raise PoolSaturated(f"{self.kind} pool is saturated ({self.pending} pending jobs)")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+thread_pool = WorkerPool("thread", settings.INFERENCE_THREAD_WORKERS, settings.INFERENCE_MAX_QUEUE)
+process_pool = WorkerPool("process", settings.INFERENCE_PROCESS_WORKERS, settings.INFERENCE_MAX_QUEUE)
+
+def pool_for(model_type: str) -> WorkerPool:
+    if model_type in HEAVY_MODELS or settings.INFERENCE_PROCESS_WORKERS <= 0:
+        return thread_pool
+    return process_pool
+
+def model_version(model_type: str) -> int:
+    """
+    Version inference for model_type is served with. Process workers hold
+    their own registry and reload when the saved artifact changes.
+    The cascade reports the newest version of its two stages.
+    """
+    if model_type == CASCADE:
+        config = load_cascade_config()
+        return max(model_version(config["fast_model"]), model_version(config["slow_model"]))
+    if pool_for(model_type) is process_pool:
+        return artifact_version(build_model(model_type).model_path)
+    return registry.version(model_type)
+
+def _predict_job(model_type, version, texts):
+    registry.ensure_version(model_type, version)
+    return predict_sentiments(model_type, texts)
+
+def _explain_job(model_type, version, text, method, num_features):
+    from app.model.explanations import explain_text
+
+    registry.ensure_version(model_type, version)
+    return explain_text(model_type, text, method, num_features)
+
+def _explain_batch_job(model_type, version, texts, method, num_features, time_budget):
+    from app.model.explanations import explain_texts
+
+    registry.ensure_version(model_type, version)
+    return explain_texts(model_type, texts, method, num_features, time_budget)
+
+async def run_inference(model_type: str, texts):
+    """
+    Scores cleaned texts on the pool suited to model_type.
+    Returns a list of (sentiment, confidence) tuples.
+
+    Results are cached per (text, model version); only unseen texts, each
+    scored once even if repeated in the batch, are sent to the pool.
+    CASCADE runs the fast and slow stages, each with its own cache.
+    """
+    if model_type == CASCADE:
+        return await run_cascade(texts)
+    pool = pool_for(model_type)
+    version = model_version(model_type)
+    # Version 0: model not loaded here yet, so results can't be attributed to a version
+    use_cache = version != 0
+    if use_cache:
+        result_cache.check_version(model_type, version)
+        results = [result_cache.get((text, model_type, version, None)) for text in texts]
+    else:
+        results = [MISS] * len(texts)
+
+    missing = list(dict.fromkeys(text for text, result in zip(texts, results) if result is MISS))
+    if missing:
+        scored = dict(zip(missing, await pool.run(_predict_job, model_type, version, missing)))
+        if use_cache:
+            for text, prediction in scored.items():
+                result_cache.put((text, model_type, version, None), prediction)
+        results = [scored[text] if result is MISS else result for text, result in zip(texts, results)]
+    return results
+
+async def run_explanation(model_type: str, text: str, method: str = "LIME", num_features: int = 10):
+    pool = pool_for(model_type)
+    version = model_version(model_type)
+    key = (text, model_type, version, f"{method}:{num_features}")
+    if version != 0:
+        result_cache.check_version(model_type, version)
+        features = result_cache.get(key)
+        if features is not MISS:
+            return features
+
+    features = await pool.run(_explain_job, model_type, version, text, method, num_features)
+    if version != 0:
+        result_cache.put(key, features)
+    return features
+
+async def run_explanations(model_type: str, texts, method: str = "LIME", num_features: int = 10, time_budget: float = None):
+    """
+    Explains a batch of cleaned texts. Uncached texts are split across the
+    process pool workers so instances are explained in parallel.
+    Budgeted calls read cached full-quality explanations but LIME results
+    computed under a budget are not cached.
+    """
+    pool = pool_for(model_type)
+    version = model_version(model_type)
+    use_cache = version != 0
+    keys = [(text, model_type, version, f"{method}:{num_features}") for text in texts]
+    if use_cache:
+        result_cache.check_version(model_type, version)
+        results = [result_cache.get(key) for key in keys]
+    else:
+        results = [MISS] * len(texts)
+
+    missing = list(dict.fromkeys(text for text, result in zip(texts, results) if result is MISS))
+    if missing:
+        # One chunk per worker; torch models already use every core within a call
+        n_chunks = min(len(missing), pool.max_workers if pool is process_pool else 1)
+        chunks = [missing[i::n_chunks] for i in range(n_chunks)]
+        explained = await asyncio.gather(*[
+            pool.run(_explain_batch_job, model_type, version, chunk, method, num_features, time_budget)
+            for chunk in chunks
+        ])
+        by_text = {text: features for chunk, chunk_features in zip(chunks, explained)
+                   for text, features in zip(chunk, chunk_features)}
+        # A budget can lower LIME's sample count; those coarser explanations
+        # must not be served later under the full-quality key
+        if use_cache and not (time_budget and method == "LIME"):
+            for text, features in by_text.items():
+                # None: not reached within the time budget, worth retrying later
+                if features is not None:
+                    result_cache.put((text, model_type, version, f"{method}:{num_features}"), features)
+        results = [by_text[text] if result is MISS else result for text, result in zip(texts, results)]
+    return results
+
+def shutdown_pools():
+    thread_pool.shutdown()
+    process_pool.shutdown()
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import joblib
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import scipy.sparse as sp
+from app.config import settings
+from app.utils.dataset_store import dataset_store, dataset_name
+
+class FeatureSet:
+    """
+    A fitted vectorizer with the train/test matrices and labels of one split,
+    and the test texts.
+    """
+    def __init__(self, key, vectorizer, X_train, X_test, y_train, y_test, test_texts, cached):
+        self.key = key
+        self.vectorizer = vectorizer
+        self.X_train = X_train
+        self.X_test = X_test
+        self.y_train = y_train
+        self.y_test = y_test
+        self.test_texts = test_texts
+        self.cached = cached  # True when loaded from the store instead of fitted
+
+class FeatureStore:
+    """
+    Fitted TF-IDF vectorizers and their sparse train/test matrices, on disk
+    under settings.FEATURE_STORE_DIR.
+
+    Entries are keyed by the content hashes of the datasets, the split ratio
+    and the vectorizer parameters, so any classical model (or a re-run)
+    trained on the same data reuses one fit. CSR components are stored as
+    raw .npy files and memory-mapped on load; the least recently used
+    entries beyond settings.FEATURE_STORE_MAX_ENTRIES are deleted.
+    """
+    def __init__(self, root: str, max_entries: int):
+        self.root = root
+        self.max_entries = max_entries
+
+    def key(self, filenames, split_ratio, vectorizer) -> str:
+        hashes = []
+        for filename in filenames:
+            dataset_store.ensure(filename)
+            hashes.append(dataset_store.info(dataset_name(filename))["content_hash"])
+        params = {name: repr(value) for name, value in sorted(vectorizer.get_params().items())}
+        spec = {
+            "datasets": hashes,
+            "split_ratio": split_ratio,
+            "vectorizer": type(vectorizer).__name__,
+            "params": params
+        }
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:32]
+
+    def load_or_build(self, filenames, split_ratio: float, vectorizer) -> FeatureSet:
+        """
+        Returns the features of filenames split at split_ratio, fitting an
+        unfitted copy of vectorizer only if the store has no such entry yet.
+        """
+        from sklearn.base import clone
+
+        key = self.key(filenames, split_ratio, vectorizer)
+        path = os.path.join(self.root, key)
+        if os.path.exists(path):
+            try:
+                return self._load(key, path)
+            except (OSError, ValueError) as e:
+                print(f"Rebuilding unreadable feature store entry {key}: {e}")
+                shutil.rmtree(path, ignore_errors=True)
+
+        from app.utils.training import load_training_data, split_data
+
+        X_train, X_test, y_train, y_test = split_data(load_training_data(filenames), split_ratio)
+        vectorizer = clone(vectorizer)
+        features = FeatureSet(
+            key, vectorizer, vectorizer.fit_transform(X_train).tocsr(), vectorizer.transform(X_test).tocsr(),
+            np.asarray(y_train), np.asarray(y_test), X_test, cached=False
+        )
+        self._save(features, path)
+        return features
+
+    def _save(self, features, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        joblib.dump(features.vectorizer, os.path.join(tmp_path, "vectorizer.joblib"))
+        for name in ("X_train", "X_test"):
+            matrix = getattr(features, name)
+            for part in ("data", "indices", "indptr"):
+                np.save(os.path.join(tmp_path, f"{name}.{part}.npy"), getattr(matrix, part))
+        np.save(os.path.join(tmp_path, "y_train.npy"), features.y_train)
+        np.save(os.path.join(tmp_path, "y_test.npy"), features.y_test)
+        pq.write_table(pa.table({"text": pa.array(features.test_texts, pa.string())}), os.path.join(tmp_path, "test_texts.parquet"))
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump({
+                "X_train_shape": features.X_train.shape,
+                "X_test_shape": features.X_test.shape,
+                "created_at": time.time()
+            }, f)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Another job stored the same features first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self._evict()
+
+    def _load(self, key, path):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        matrices = {}
+        for name in ("X_train", "X_test"):
+            data, indices, indptr = (
+                np.load(os.path.join(path, f"{name}.{part}.npy"), mmap_mode="r")
+                for part in ("data", "indices", "indptr")
+            )
+            matrices[name] = sp.csr_matrix((data, indices, indptr), shape=tuple(meta[f"{name}_shape"]), copy=False)
+        # Marks the entry as recently used for eviction
+        os.utime(path)
+        return FeatureSet(
+            key, joblib.load(os.path.join(path, "vectorizer.joblib")), matrices["X_train"], matrices["X_test"],
+            np.load(os.path.join(path, "y_train.npy")), np.load(os.path.join(path, "y_test.npy")),
+            pq.read_table(os.path.join(path, "test_texts.parquet")).column("text").to_pylist(), cached=True
+        )
+
+    def _evict(self):
+        entries = [os.path.join(self.root, entry) for entry in os.listdir(self.root) if not entry.endswith(".tmp")]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            shutil.rmtree(path, ignore_errors=True)
+
+feature_store = FeatureStore(settings.FEATURE_STORE_DIR, settings.FEATURE_STORE_MAX_ENTRIES)
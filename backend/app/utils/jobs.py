@@ -0,0 +1,212 @@
+import functools
+import json
+import multiprocessing
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from app.config import settings
+
+ACTIVE_STATUSES = ("Queued", "Training")
+
+class JobCancelled(Exception):
+    pass
+
+def _pid_alive(pid) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class JobStore:
+    """
+    Training job state in SQLite, shared by every API worker and the training
+    processes and kept across restarts.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    task_id TEXT PRIMARY KEY,
+                    model_type TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    request TEXT,
+                    pid INTEGER,
+                    progress REAL DEFAULT 0,
+                    epoch INTEGER DEFAULT 0,
+                    total_epochs INTEGER,
+                    eta_seconds REAL,
+                    metrics TEXT,
+                    error TEXT,
+                    cancel_requested INTEGER DEFAULT 0,
+                    created_at REAL,
+                    started_at REAL,
+                    updated_at REAL
+                )
+            """)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, task_id: str, model_type: str, request: dict):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (task_id, model_type, status, request, pid, created_at, updated_at) "
+                "VALUES (?, ?, 'Queued', ?, ?, ?, ?)",
+                (task_id, model_type, json.dumps(request), os.getpid(), now, now)
+            )
+
+    def update(self, task_id: str, **fields):
+        if "metrics" in fields:
+            fields["metrics"] = json.dumps(fields["metrics"])
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE task_id = ?", (*fields.values(), task_id))
+
+    def _row(self, row):
+        job = dict(row)
+        job["request"] = json.loads(job["request"]) if job["request"] else None
+        job["metrics"] = json.loads(job["metrics"]) if job["metrics"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def get(self, task_id: str):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE task_id = ?", (task_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def list(self, limit: int = 50):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._row(row) for row in rows]
+
+    def request_cancel(self, task_id: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE task_id = ? AND status IN (?, ?)",
+                (time.time(), task_id, *ACTIVE_STATUSES)
+            )
+        return cursor.rowcount > 0
+
+    def is_cancel_requested(self, task_id: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE task_id = ?", (task_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def clear_finished(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE status NOT IN (?, ?)", ACTIVE_STATUSES)
+
+    def fail_orphaned(self):
+        """
+        Marks active jobs whose owning process is gone (server restart, crash) as failed.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT task_id, pid FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES
+            ).fetchall()
+        for row in rows:
+            if not _pid_alive(row["pid"]):
+                self.update(row["task_id"], status="Failed", error="Interrupted by a server restart")
+
+class JobEngine:
+    """
+    Runs training jobs in separate processes so the API stays responsive.
+    At most settings.TRAINING_MAX_JOBS jobs train at once; the rest wait
+    as "Queued". Cancellation is cooperative: a running job stops at its
+    next epoch boundary.
+
+    When a job completes, its models are reloaded into this process'
+    registry on a background thread, not on the executor's callback
+    thread. Process-pool inference workers keep their own registries and
+    are not reloaded from here: every request passes them the version
+    (artifact mtime) it expects and a worker reloads on a mismatch
+    (registry.ensure_version), so each worker picks up the new model on
+    its next request.
+    """
+    def __init__(self, store: JobStore, max_jobs: int):
+        self.store = store
+        self.max_jobs = max_jobs
+        self._executor = None
+        self._futures = {}
+        # One thread, so loads of heavy models (LSTM, BERT) don't pile up in memory at once
+        self._reloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-reload")
+
+    def _get_executor(self):
+        if self._executor is None:
+            # One fresh process per job: the memory of a finished BERT run is returned to the OS
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=1
+            )
+        return self._executor
+
+    def submit(self, job_type: str, payload: dict, target, models) -> str:
+        """
+        Queues target(task_id, payload) in a training process.
+        models: model types to hot-swap into the registry once it completed.
+        """
+        task_id = f"task_{job_type.lower()}_{uuid.uuid4().hex[:12]}"
+        self.store.create(task_id, job_type, payload)
+        future = self._get_executor().submit(target, task_id, payload)
+        self._futures[task_id] = future
+        future.add_done_callback(functools.partial(self._finished, task_id, models))
+        return task_id
+
+    def _finished(self, task_id, models, future):
+        self._futures.pop(task_id, None)
+        if future.cancelled():
+            self.store.update(task_id, status="Cancelled")
+            return
+        if future.exception() is not None:
+            # The training process died before it could record the failure itself
+            self.store.update(task_id, status="Failed", error=str(future.exception()))
+            return
+        job = self.store.get(task_id)
+        if job and job["status"] == "Completed":
+            self._reloader.submit(self._reload, models)
+
+    def _reload(self, models):
+        from app.model.registry import registry
+        # Hot-swap the new versions into the registry for all routes
+        for model_type in models:
+            try:
+                registry.reload(model_type)
+            except Exception as e:
+                print(f"Reloading {model_type} after training failed: {e}")
+
+    def cancel(self, task_id: str) -> bool:
+        requested = self.store.request_cancel(task_id)
+        future = self._futures.get(task_id)
+        if future is not None:
+            # Only succeeds while still queued; running jobs see the flag
+            future.cancel()
+        return requested
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._reloader.shutdown(wait=False, cancel_futures=True)
+
+job_store = JobStore(settings.JOB_DB_PATH)
+job_engine = JobEngine(job_store, settings.TRAINING_MAX_JOBS)
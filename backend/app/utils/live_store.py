@@ -0,0 +1,309 @@
+import glob
+import math
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import quote, unquote
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from app.config import settings
+
+SCHEMA = pa.schema([
+    ("created_at", pa.float64()),  # Tweet time, epoch seconds
+    ("scored_at", pa.float64()),
+    ("keyword", pa.string()),
+    ("text", pa.string()),
+    ("sentiment", pa.string()),
+    ("confidence", pa.float64()),
+    ("user_id", pa.string()),
+    ("username", pa.string()),
+    ("country", pa.string()),
+    ("model_type", pa.string()),
+    ("model_version", pa.int64()),
+])
+HOUR_FORMAT = "%Y%m%d%H"
+NO_KEYWORD = ""
+
+def _timestamp(value, default):
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    return default
+
+def _hour_dir(timestamp):
+    return "hour=" + datetime.fromtimestamp(timestamp, timezone.utc).strftime(HOUR_FORMAT)
+
+def _keyword_dir(keyword):
+    # Hive-style and fully quoted, so no keyword can escape the hour directory
+    return "keyword=" + quote(keyword, safe="")
+
+class Segment:
+    """
+    One immutable Parquet file:
+    root/hour=<YYYYMMDDHH>/keyword=<keyword>/<min ms>_<max ms>_<pid>_<seq>.parquet
+    The created_at range is in the name, so pruning never opens the file.
+    """
+    def __init__(self, path, hour, keyword, min_ts, max_ts):
+        self.path = path
+        self.hour = hour
+        self.keyword = keyword
+        self.min_ts = min_ts
+        self.max_ts = max_ts
+
+    def overlaps(self, start, end):
+        return (start is None or self.max_ts >= start) and (end is None or self.min_ts < end)
+
+class LiveStore:
+    """
+    Append-only storage of scored live tweets under settings.LIVE_DATA_DIR.
+
+    Appends are buffered in memory per (hour, keyword) partition and written
+    as one zstd-compressed Parquet segment when a partition reaches
+    settings.LIVE_FLUSH_ROWS rows or its oldest row is older than
+    settings.LIVE_FLUSH_SECONDS, so ingest costs one file write per batch,
+    not a sync per tweet. Segments are written by a single background
+    thread, never by the caller (the event loop), and start() runs a
+    flusher that writes partitions which stopped receiving tweets once they
+    are old enough. Rows not yet written are lost if the process crashes;
+    stop() writes them on shutdown. Queries prune by hour directory,
+    keyword directory and the created_at range in each segment's name.
+    """
+    def __init__(self, root: str, flush_rows: int, flush_seconds: float):
+        self.root = root
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._buffers = {}  # (hour, keyword) -> (first append time, rows)
+        self._pending = {}  # id(rows) -> rows handed to the writer, still readable until written
+        self._sequence = 0
+        self._lock = threading.Lock()
+        # Held while a segment replaces its pending rows, so a query sees them exactly once
+        self._publish_lock = threading.Lock()
+        self._writer = None
+        self._flusher = None
+        self._stopped = threading.Event()
+
+    def append(self, results, tweets_data, keyword: str = None, model_type: str = None, model_version: int = 0):
+        """
+        Buffers scored AnalysisResult items with their source tweets.
+        """
+        now = time.time()
+        keyword = keyword or NO_KEYWORD
+        ready = []
+        with self._lock:
+            for result, tweet in zip(results, tweets_data):
+                created_at = _timestamp(tweet.get("created_at"), now)
+                partition = (_hour_dir(created_at), keyword)
+                started, rows = self._buffers.setdefault(partition, (now, []))
+                rows.append({
+                    "created_at": created_at,
+                    "scored_at": now,
+                    "keyword": keyword,
+                    "text": result.text,
+                    "sentiment": result.sentiment,
+                    "confidence": result.confidence,
+                    "user_id": result.user_id,
+                    "username": result.username,
+                    "country": result.country,
+                    "model_type": model_type,
+                    "model_version": model_version
+                })
+            for partition, (started, rows) in list(self._buffers.items()):
+                if len(rows) >= self.flush_rows or now - started >= self.flush_seconds:
+                    ready.append((partition, self._take(partition)))
+        self._submit(ready)
+
+    def flush(self, max_age: float = None, wait: bool = False):
+        """
+        Hands buffered partitions (only those older than max_age seconds, if
+        given) to the writer; wait blocks until every segment is written.
+        """
+        now = time.time()
+        with self._lock:
+            ready = [
+                (partition, self._take(partition))
+                for partition, (started, _) in list(self._buffers.items())
+                if max_age is None or now - started >= max_age
+            ]
+        self._submit(ready)
+        if wait:
+            self._drain()
+
+    def start(self):
+        """
+        Starts the background flusher, so a keyword that stops receiving
+        tweets still has its rows written within about settings.LIVE_FLUSH_SECONDS.
+        """
+        if self._flusher is None:
+            self._stopped.clear()
+            self._flusher = threading.Thread(target=self._flush_periodically, name="live-store-flusher", daemon=True)
+            self._flusher.start()
+
+    def stop(self):
+        """
+        Stops the flusher and writes every buffered row. Runs on shutdown.
+        """
+        self._stopped.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush(wait=True)
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(max(self.flush_seconds / 4, 1.0)):
+            self.flush(max_age=self.flush_seconds)
+
+    def _take(self, partition):
+        # Called with the lock held: the rows stay visible to query() until written
+        rows = self._buffers.pop(partition)[1]
+        self._pending[id(rows)] = rows
+        return rows
+
+    def _submit(self, ready):
+        if not ready:
+            return
+        with self._lock:
+            if self._writer is None:
+                # One thread keeps segment writes off the event loop and in order
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-store")
+            writer = self._writer
+        for partition, rows in ready:
+            writer.submit(self._write_pending, partition, rows)
+
+    def _write_pending(self, partition, rows):
+        try:
+            self._write(partition, rows)
+        except Exception as e:
+            print(f"Failed to write live segment {partition}: {e}")
+            with self._lock:
+                self._pending.pop(id(rows), None)
+
+    def _drain(self):
+        with self._lock:
+            writer = self._writer
+        if writer is not None:
+            # The writer runs jobs in order, so this returns after every earlier write
+            writer.submit(lambda: None).result()
+
+    def _write(self, partition, rows):
+        hour, keyword = partition
+        table = pa.Table.from_pylist(rows, schema=SCHEMA)
+        created = table.column("created_at")
+        min_ts, max_ts = pc.min(created).as_py(), pc.max(created).as_py()
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+
+        directory = os.path.join(self.root, hour, _keyword_dir(keyword))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(
+            directory, f"{math.floor(min_ts * 1000)}_{math.ceil(max_ts * 1000)}_{os.getpid()}_{sequence}.parquet"
+        )
+        # Written under a temporary name so readers never see a partial segment
+        pq.write_table(table, path + ".tmp", compression="zstd")
+        with self._publish_lock:
+            os.replace(path + ".tmp", path)
+            with self._lock:
+                self._pending.pop(id(rows), None)
+
+    def segments(self, start: float = None, end: float = None, keyword: str = None):
+        """
+        Segments that may hold rows with start <= created_at < end for keyword.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        first_hour = _hour_dir(start) if start is not None else None
+        last_hour = _hour_dir(end) if end is not None else None
+        found = []
+        for hour in sorted(os.listdir(self.root)):
+            if not hour.startswith("hour=") or (first_hour and hour < first_hour) or (last_hour and hour > last_hour):
+                continue
+            hour_dir = os.path.join(self.root, hour)
+            keywords = os.listdir(hour_dir) if keyword is None else [_keyword_dir(keyword)]
+            for keyword_dir in keywords:
+                directory = os.path.join(hour_dir, keyword_dir)
+                if not os.path.isdir(directory):
+                    continue
+                for name in os.listdir(directory):
+                    if not name.endswith(".parquet"):
+                        continue
+                    min_ms, max_ms = (int(part) for part in name.split("_")[:2])
+                    segment = Segment(
+                        os.path.join(directory, name), hour, unquote(keyword_dir[len("keyword="):]),
+                        min_ms / 1000, max_ms / 1000
+                    )
+                    if segment.overlaps(start, end):
+                        found.append(segment)
+        return found
+
+    def query(self, start: float = None, end: float = None, keyword: str = None, limit: int = 1000):
+        """
+        Stored tweets with start <= created_at < end (epoch seconds), newest
+        first, including rows not yet written.
+        """
+        condition = pc.scalar(True)
+        if start is not None:
+            condition &= pc.field("created_at") >= start
+        if end is not None:
+            condition &= pc.field("created_at") < end
+        if keyword is not None:
+            condition &= pc.field("keyword") == (keyword or NO_KEYWORD)
+
+        with self._publish_lock:
+            segments = self.segments(start, end, keyword)
+            with self._lock:
+                buffered = [row for _, rows in self._buffers.values() for row in rows]
+                buffered += [row for rows in self._pending.values() for row in rows]
+        tables = []
+        for segment in segments:
+            try:
+                tables.append(pq.read_table(segment.path, filters=condition, memory_map=True))
+            except FileNotFoundError:
+                # Removed by drop() or clear() since it was listed
+                continue
+        if buffered:
+            tables.append(pa.Table.from_pylist(buffered, schema=SCHEMA).filter(condition))
+        if not tables:
+            return []
+        table = pa.concat_tables(tables).sort_by([("created_at", "descending")])
+        return table.slice(0, limit).to_pylist()
+
+    def drop(self, before: float = None, keyword: str = None) -> int:
+        """
+        Deletes whole segments (keyword's, or all) whose rows are all older
+        than before (or every segment). Returns the number dropped.
+        """
+        dropped = 0
+        for segment in self.segments(keyword=keyword):
+            if before is None or segment.max_ts < before:
+                os.remove(segment.path)
+                dropped += 1
+                for directory in (os.path.dirname(segment.path), os.path.join(self.root, segment.hour)):
+                    try:
+                        os.rmdir(directory)
+                    except OSError:
+                        # Not empty
+                        pass
+        return dropped
+
+    def clear(self):
+        """
+        Drops every stored and buffered tweet.
+        """
+        with self._lock:
+            self._buffers = {}
+        # Segments already handed to the writer must land before the rename, not after it
+        self._drain()
+        if os.path.isdir(self.root):
+            # One rename makes the data disappear at once; deleting the files can happen later
+            os.rename(self.root, f"{self.root}.dropped.{time.time_ns()}")
+        os.makedirs(self.root, exist_ok=True)
+        # Includes drops a previous process didn't get to finish deleting
+        trash = glob.glob(f"{glob.escape(self.root)}.dropped.*")
+        threading.Thread(target=lambda: [shutil.rmtree(path, ignore_errors=True) for path in trash], daemon=True).start()
+
+live_store = LiveStore(settings.LIVE_DATA_DIR, settings.LIVE_FLUSH_ROWS, settings.LIVE_FLUSH_SECONDS)
@@ -1,5 +1,27 @@
+import os
 import re
 import string
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+MENTION_PATTERN = re.compile(r'@\w+')
+DIGITS_PATTERN = re.compile(r'\d+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+# clean_texts cleans a whole chunk as one string, texts separated by SEPARATOR
+SEPARATOR = '\x00'
+# Everything clean_text deletes, in one pass: URLs, mentions, then runs of
+# punctuation and digits. A mention stops where a URL would start, matching
+# clean_text which strips URLs before mentions; "@" is left out of the run
+# so a run never swallows the start of a mention. URLs stop at SEPARATOR.
+DELETE_PATTERN = re.compile(
+    r'(?:http|www)[^\s\x00]+'
+    r'|@(?:(?!(?:http|www)[^\s\x00])\w)+'
+    r'|[' + re.escape(string.punctuation.replace('@', '')) + r'\d]+'
+    r'|@'
+)
 
 def clean_text(text: str) -> str:
     """
@@ -13,12 +35,53 @@ def clean_text(text: str) -> str:
     """
     if not isinstance(text, str):
         return ""
-    
+
     text = text.lower()
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-    text = re.sub(r'@\w+', '', text)
-    text = text.translate(str.maketrans('', '', string.punctuation))
-    text = re.sub(r'\d+', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    
+    text = URL_PATTERN.sub('', text)
+    text = MENTION_PATTERN.sub('', text)
+    text = text.translate(PUNCTUATION_TABLE)
+    text = DIGITS_PATTERN.sub('', text)
+    text = WHITESPACE_PATTERN.sub(' ', text).strip()
+
     return text
+
+def _clean_chunk(texts):
+    # Same output as clean_text for every text: the chunk is lowercased and
+    # cleaned as one string, so the regex and whitespace passes run once
+    strings = [t if isinstance(t, str) else "" for t in texts]
+    if not strings:
+        return []
+    text = SEPARATOR.join(strings)
+    if text.count(SEPARATOR) != len(strings) - 1:
+        # A text contains the separator itself
+        return [clean_text(t) for t in texts]
+
+    text = DELETE_PATTERN.sub('', text.lower())
+    # str.split() and \s agree on what counts as whitespace
+    text = ' '.join(text.split())
+    return text.replace(' ' + SEPARATOR, SEPARATOR).replace(SEPARATOR + ' ', SEPARATOR).split(SEPARATOR)
+
+def clean_texts(texts, n_jobs: int = 1, chunk_size: int = 100000):
+    """
+    Cleans a batch of texts with the same rules as clean_text.
+
+    texts: list of strings or a pandas Series. A Series is returned as a
+    Series with the same index; anything else returns a list.
+    n_jobs: processes to split large inputs across, in chunks of chunk_size rows,
+    capped at the number of CPUs. Only worth it for training sets of millions
+    of rows: starting the processes costs more than cleaning smaller inputs.
+    """
+    is_series = isinstance(texts, pd.Series)
+    values = texts.tolist() if is_series else list(texts)
+
+    n_jobs = min(n_jobs, os.cpu_count() or 1)
+    if n_jobs > 1 and len(values) > chunk_size:
+        chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            cleaned = [t for chunk in executor.map(_clean_chunk, chunks) for t in chunk]
+    else:
+        cleaned = [t for start in range(0, len(values), chunk_size) for t in _clean_chunk(values[start:start + chunk_size])]
+
+    if is_series:
+        return pd.Series(cleaned, index=texts.index, dtype=object)
+    return cleaned
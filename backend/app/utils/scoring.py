@@ -0,0 +1,50 @@
+from app.schemas import AnalysisResult
+from app.utils.aggregator import aggregator
+from app.utils.drift import drift_monitor
+from app.utils.executor import run_inference, model_version
+from app.utils.live_store import live_store
+from app.utils.preprocess import clean_texts
+
+def mock_sentiment(text: str):
+    import random
+    text_lower = text.lower()
+
+    # Simple rule-based mock sentiment for consistency with the generated text
+    if any(w in text_lower for w in ["terrible", "bad", "slow", "broken", "useless", "disappointing"]):
+        return "Negative", random.uniform(0.75, 0.99)
+    elif any(w in text_lower for w in ["amazing", "incredible", "fantastic", "fast", "revolutionary", "brilliant"]):
+        return "Positive", random.uniform(0.75, 0.99)
+    return random.choice(["Neutral", "Positive", "Negative"]), random.uniform(0.55, 0.85)
+
+async def score_tweets(model_type: str, tweets_data, keyword: str = None):
+    """
+    Scores fetched tweets and returns them as AnalysisResult items.
+    Falls back to rule-based mock sentiment if the model is not trained yet.
+    Every scored batch is recorded in the live aggregator and drift monitor
+    and stored under keyword.
+    """
+    cleaned = clean_texts([t['text'] for t in tweets_data])
+    try:
+        predictions = await run_inference(model_type, cleaned)
+        version = model_version(model_type)
+    except (FileNotFoundError, ValueError, NotImplementedError) as e:
+        print(f"Using MOCK sentiment: {e}")
+        predictions = [mock_sentiment(t['text']) for t in tweets_data]
+        version = 0
+
+    results = []
+    for tweet, (sent, conf) in zip(tweets_data, predictions):
+        results.append(AnalysisResult(
+            text=tweet['text'],
+            sentiment=sent,
+            confidence=round(conf, 4),
+            explanation=None,
+            user_id=tweet.get("user_id", "Unknown"),
+            username=tweet.get("username", "Unknown"),
+            country=tweet.get("country", "Unknown")
+        ))
+
+    aggregator.add(results, keyword=keyword, model_type=model_type, cleaned_texts=cleaned)
+    drift_monitor.observe(model_type, version, cleaned, predictions)
+    live_store.append(results, tweets_data, keyword=keyword, model_type=model_type, model_version=version)
+    return results
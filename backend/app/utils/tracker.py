@@ -0,0 +1,128 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import aclosing
+from app.config import settings
+from app.utils.scoring import score_tweets
+from app.utils.twitter_client import twitter_client
+
+class TrackedKeyword:
+    """
+    Scored tweets for one keyword, kept in a bounded ring buffer. Sentiment
+    counts are updated on every append/evict so summaries are O(1).
+    """
+    def __init__(self, keyword: str, model_type: str, capacity: int):
+        self.keyword = keyword
+        self.model_type = model_type
+        self.results = deque(maxlen=capacity)
+        self.counts = {}
+        self.confidence_sum = 0.0
+        self.since_id = None
+        self.total_scored = 0
+        self.last_polled = None
+        self.last_error = None
+        self.task = None
+
+    def add(self, results):
+        for result in results:
+            if len(self.results) == self.results.maxlen:
+                evicted = self.results[0]
+                self.counts[evicted.sentiment] -= 1
+                self.confidence_sum -= evicted.confidence
+            self.results.append(result)
+            self.counts[result.sentiment] = self.counts.get(result.sentiment, 0) + 1
+            self.confidence_sum += result.confidence
+        self.total_scored += len(results)
+
+    def latest(self, limit: int):
+        """
+        Most recent results first.
+        """
+        limit = min(limit, len(self.results))
+        return [self.results[-i] for i in range(1, limit + 1)]
+
+    def summary(self):
+        size = len(self.results)
+        return {
+            "keyword": self.keyword,
+            "model_type": self.model_type,
+            "buffered": size,
+            "total_scored": self.total_scored,
+            "sentiment_counts": dict(self.counts),
+            "mean_confidence": round(self.confidence_sum / size, 4) if size else None,
+            "since_id": self.since_id,
+            "last_polled": self.last_polled,
+            "last_error": self.last_error
+        }
+
+class KeywordTracker:
+    """
+    Polls registered keywords in the background. Each poll asks only for
+    tweets newer than the last one seen (since_id), scores them and appends
+    them to the keyword's buffer.
+    """
+    def __init__(self, poll_interval: float = None, capacity: int = None, max_per_poll: int = None):
+        self.poll_interval = poll_interval or settings.TRACK_POLL_INTERVAL_SECONDS
+        self.capacity = capacity or settings.TRACK_BUFFER_SIZE
+        self.max_per_poll = max_per_poll or settings.TRACK_MAX_PER_POLL
+        self.keywords = {}
+
+    def track(self, keyword: str, model_type: str) -> TrackedKeyword:
+        tracked = self.keywords.get(keyword)
+        if tracked is not None and tracked.model_type == model_type:
+            return tracked
+        if tracked is not None:
+            self.untrack(keyword)
+
+        tracked = TrackedKeyword(keyword, model_type, self.capacity)
+        tracked.task = asyncio.get_running_loop().create_task(self._poll_loop(tracked))
+        self.keywords[keyword] = tracked
+        return tracked
+
+    def untrack(self, keyword: str) -> bool:
+        tracked = self.keywords.pop(keyword, None)
+        if tracked is None:
+            return False
+        tracked.task.cancel()
+        return True
+
+    def get(self, keyword: str):
+        return self.keywords.get(keyword)
+
+    def summaries(self):
+        return [tracked.summary() for tracked in self.keywords.values()]
+
+    def stop_all(self):
+        for keyword in list(self.keywords):
+            self.untrack(keyword)
+
+    async def poll(self, tracked: TrackedKeyword):
+        """
+        Fetches every page of tweets newer than since_id, then scores and
+        records them oldest first in one step. If a page fails nothing is
+        recorded and since_id stays put, so the next poll retries the same
+        tweets instead of scoring the earlier pages twice.
+        """
+        tweets = {}
+        async with aclosing(twitter_client.pages(tracked.keyword, self.max_per_poll, since_id=tracked.since_id)) as pages:
+            async for page in pages:
+                for tweet in page:
+                    tweets[int(tweet["id"])] = tweet
+        if tweets:
+            # Pages are newest first; keep the buffer in arrival order
+            results = await score_tweets(tracked.model_type, [tweets[i] for i in sorted(tweets)], tracked.keyword)
+            tracked.add(results)
+            tracked.since_id = str(max(tweets))
+        tracked.last_polled = time.time()
+
+    async def _poll_loop(self, tracked: TrackedKeyword):
+        while True:
+            try:
+                await self.poll(tracked)
+                tracked.last_error = None
+            except Exception as e:
+                print(f"Error polling '{tracked.keyword}': {e}")
+                tracked.last_error = str(e)
+            await asyncio.sleep(self.poll_interval)
+
+tracker = KeywordTracker()
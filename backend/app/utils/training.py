@@ -0,0 +1,321 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
+from sklearn.model_selection import train_test_split
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
+from app.config import settings
+from app.model.registry import build_model, HEAVY_MODELS
+from app.model.streaming import IncrementalTfidf, partial_fit_chunks
+from app.utils.dataset_store import dataset_store
+from app.utils.drift import snapshot_reference
+from app.utils.feature_store import feature_store
+from app.utils.jobs import job_store, JobCancelled
+
+DEFAULT_EPOCHS = {"LSTM": 5, "BERT": 3}
+COMPARISON_MODELS = ["SVM", "RF", "LR"]
+# Models that can train with partial_fit in streaming mode; SVM gets calibrated probabilities
+STREAMING_LOSSES = {"LR": "log_loss", "SVM": "hinge"}
+COMPARISON_REPORT_PATH = os.path.join(settings.MODEL_SAVE_DIR, "comparison_report.json")
+
+def load_training_data(filenames):
+    """
+    Reads and concatenates datasets from the dataset store (raw CSVs in
+    settings.TRAINED_DATA_DIR are ingested on first use). Each needs a
+    'text' and a 'label' column; labels are 0/1 or "negative"/"positive".
+    Returns a DataFrame with cleaned_text and label columns.
+    """
+    frames = [dataset_store.read(filename) for filename in filenames]
+    return pd.concat(frames, ignore_index=True)
+
+def iter_training_chunks(filenames, chunk_rows: int):
+    """
+    Streams the same rows as load_training_data, chunk_rows at a time.
+    Yields (cleaned texts, labels array) per chunk.
+    """
+    # Resolve every dataset up front so a missing one fails before any training
+    for filename in filenames:
+        dataset_store.ensure(filename)
+    for filename in filenames:
+        for df in dataset_store.iter_batches(filename, chunk_rows):
+            yield df["cleaned_text"].tolist(), df["label"].to_numpy()
+
+def peak_rss_mb():
+    """
+    Peak resident memory of this process in MB, None where unsupported (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def split_data(data, split_ratio):
+    stratify = data["label"] if data["label"].value_counts().min() >= 2 else None
+    return train_test_split(
+        data["cleaned_text"].tolist(), data["label"].tolist(),
+        train_size=split_ratio, stratify=stratify, random_state=42
+    )
+
+def classification_metrics(y_true, y_pred):
+    return {
+        "accuracy": float(accuracy_score(y_true, y_pred)),
+        "precision": float(precision_score(y_true, y_pred, average='weighted', zero_division=0)),
+        "recall": float(recall_score(y_true, y_pred, average='weighted', zero_division=0)),
+        "f1_score": float(f1_score(y_true, y_pred, average='weighted', zero_division=0)),
+        "confusion_matrix": confusion_matrix(y_true, y_pred).tolist()
+    }
+
+def new_model(model_type: str):
+    if model_type == "BERT":
+        from app.model.bert_model import BertModelWrapper
+        # Fine-tuning starts from the pretrained base weights
+        return BertModelWrapper()
+    return build_model(model_type)
+
+def train_from_features(model, filenames, split_ratio):
+    """
+    Fits a classical model's classifier on cached TF-IDF features (see
+    app.utils.feature_store) instead of refitting its vectorizer on the
+    same texts. Returns the test metrics and the test texts.
+    """
+    features = feature_store.load_or_build(filenames, split_ratio, model.model.steps[0][1])
+    classifier = clone(model.model.steps[-1][1]).fit(features.X_train, features.y_train)
+    model.model = make_pipeline(features.vectorizer, classifier)
+    metrics = {
+        **classification_metrics(features.y_test, classifier.predict(features.X_test)),
+        "feature_cache_hit": features.cached
+    }
+    return metrics, features.test_texts
+
+def fit_streaming(model_type: str, document_chunks, training_chunks, on_pass=None):
+    """
+    The fixed-memory LR/SVM pipeline: document_chunks, an iterable of
+    (texts, labels), feeds the document frequencies of a hashed TF-IDF,
+    then training_chunks (the same rows, read again) trains an SGD model
+    with partial_fit. on_pass(1) is called between the passes.
+    Returns the fitted pipeline.
+    """
+    tfidf = IncrementalTfidf(settings.STREAMING_HASH_FEATURES)
+    for texts, _ in document_chunks:
+        tfidf.partial_fit(texts)
+    tfidf.finalize()
+    if on_pass:
+        on_pass(1)
+
+    classifier = partial_fit_chunks(
+        SGDClassifier(loss=STREAMING_LOSSES[model_type]), training_chunks,
+        tfidf.transform, calibrate=model_type == "SVM"
+    )
+    return make_pipeline(*tfidf.pipeline_steps(), classifier)
+
+def train_streaming(task_id: str, request: dict, on_epoch):
+    """
+    Fixed-memory training for LR and SVM: the datasets are read in chunks of
+    settings.TRAINING_CHUNK_ROWS rows, twice. Pass 1 accumulates document
+    frequencies for a hashed TF-IDF, pass 2 trains an SGD model with
+    partial_fit. Rows are split the same way in both passes; at most
+    settings.STREAMING_TEST_ROWS test rows are kept for evaluation.
+    Returns (model, test texts, test labels).
+    """
+    model_type = request["model_type"]
+    if model_type not in STREAMING_LOSSES:
+        raise ValueError(f"Streaming training supports {', '.join(STREAMING_LOSSES)}, not {model_type}")
+    split_ratio = request.get("split_ratio", 0.8)
+
+    def train_rows(test_texts=None, test_labels=None):
+        rng = np.random.default_rng(42)
+        for texts, labels in iter_training_chunks(request["dataset_filenames"], settings.TRAINING_CHUNK_ROWS):
+            if job_store.is_cancel_requested(task_id):
+                raise JobCancelled()
+            texts = np.asarray(texts, dtype=object)
+            is_test = rng.random(len(texts)) >= split_ratio
+            if test_texts is not None:
+                room = settings.STREAMING_TEST_ROWS - len(test_texts)
+                test_texts.extend(texts[is_test][:room])
+                test_labels.extend(labels[is_test][:room])
+            yield texts[~is_test].tolist(), labels[~is_test]
+
+    test_texts, test_labels = [], []
+    model = build_model(model_type)
+    model.model = fit_streaming(
+        model_type, train_rows(), train_rows(test_texts, test_labels), on_pass=lambda done: on_epoch(done, 2)
+    )
+    on_epoch(2, 2)
+    return model, test_texts, test_labels
+
+def run_training_job(task_id: str, request: dict):
+    """
+    Trains, evaluates and saves one model. Runs in a training process and
+    reports progress, metrics and failures to the job store.
+    """
+    if job_store.is_cancel_requested(task_id):
+        job_store.update(task_id, status="Cancelled")
+        return
+
+    model_type = request["model_type"]
+    start = time.time()
+    job_store.update(task_id, status="Training", pid=os.getpid(), started_at=start)
+    try:
+        if model_type in HEAVY_MODELS:
+            import torch
+            # Share the cores between the jobs that may run side by side
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // settings.TRAINING_MAX_JOBS))
+
+        def on_epoch(epoch, epochs):
+            elapsed = time.time() - start
+            job_store.update(
+                task_id, epoch=epoch, total_epochs=epochs, progress=epoch / epochs,
+                eta_seconds=elapsed / epoch * (epochs - epoch)
+            )
+            if job_store.is_cancel_requested(task_id):
+                raise JobCancelled()
+
+        metrics = None
+        if request.get("streaming"):
+            model, X_test, y_test = train_streaming(task_id, request, on_epoch)
+        elif model_type not in HEAVY_MODELS:
+            model = build_model(model_type)
+            job_store.update(task_id, total_epochs=1)
+            metrics, X_test = train_from_features(model, request["dataset_filenames"], request.get("split_ratio", 0.8))
+            on_epoch(1, 1)
+        else:
+            data = load_training_data(request["dataset_filenames"])
+            X_train, X_test, y_train, y_test = split_data(data, request.get("split_ratio", 0.8))
+            del data
+            model = new_model(model_type)
+            epochs = request.get("epochs") or DEFAULT_EPOCHS[model_type]
+            job_store.update(task_id, total_epochs=epochs)
+            model.train(X_train, y_train, epochs=epochs, on_epoch=on_epoch)
+
+        if metrics is None:
+            metrics = model.evaluate(X_test, y_test)
+        model.save()
+        # Reference distributions for trained-vs-live drift of this version
+        snapshot_reference(model, X_test)
+        if model_type in HEAVY_MODELS and settings.QUANTIZED_INFERENCE:
+            from app.model.quantization import run_quantization_gate
+            run_quantization_gate(model, X_test, y_test)
+
+        metrics["peak_rss_mb"] = peak_rss_mb()
+        job_store.update(task_id, status="Completed", progress=1.0, eta_seconds=0.0, metrics=metrics)
+    except JobCancelled:
+        job_store.update(task_id, status="Cancelled", eta_seconds=None)
+    except Exception as e:
+        job_store.update(task_id, status="Failed", error=str(e), eta_seconds=None)
+
+def _fit_classifier(classifier, X_train, y_train, X_test):
+    start = time.perf_counter()
+    classifier.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    y_pred = classifier.predict(X_test)
+    return classifier, y_pred, fit_seconds, time.perf_counter() - start
+
+def run_comparison_job(task_id: str, request: dict):
+    """
+    Trains the classical models on one split and writes a comparison report.
+
+    The TF-IDF vectorizer is fitted once and its sparse matrices are shared
+    by every classifier; the classifiers are fitted side by side on threads
+    (liblinear, libsvm and tree building release the GIL), with the random
+    forest also spreading its trees over all cores.
+    """
+    if job_store.is_cancel_requested(task_id):
+        job_store.update(task_id, status="Cancelled")
+        return
+
+    model_types = request.get("model_types") or COMPARISON_MODELS
+    start = time.time()
+    job_store.update(task_id, status="Training", pid=os.getpid(), started_at=start, total_epochs=len(model_types))
+    try:
+        vectorize_start = time.perf_counter()
+        features = feature_store.load_or_build(request["dataset_filenames"], request.get("split_ratio", 0.8), TfidfVectorizer())
+        vectorizer, y_test = features.vectorizer, features.y_test
+        X_train_tfidf, X_test_tfidf = features.X_train, features.X_test
+        vectorize_seconds = time.perf_counter() - vectorize_start
+
+        models = {model_type: build_model(model_type) for model_type in model_types}
+        classifiers = {}
+        for model_type, model in models.items():
+            classifiers[model_type] = clone(model.model.steps[-1][1])
+            if "n_jobs" in classifiers[model_type].get_params():
+                classifiers[model_type].set_params(n_jobs=-1)
+
+        fitted = Parallel(n_jobs=len(classifiers), prefer="threads")(
+            delayed(_fit_classifier)(classifier, X_train_tfidf, features.y_train, X_test_tfidf)
+            for classifier in classifiers.values()
+        )
+        if job_store.is_cancel_requested(task_id):
+            raise JobCancelled()
+
+        results = {}
+        for (model_type, model), (classifier, y_pred, fit_seconds, predict_seconds) in zip(models.items(), fitted):
+            if "n_jobs" in classifier.get_params():
+                # Serving already runs one model per inference worker process
+                classifier.set_params(n_jobs=None)
+            # Already fitted: the pipeline only ties the shared vectorizer to the classifier
+            model.model = make_pipeline(vectorizer, classifier)
+            model.save()
+            snapshot_reference(model, features.test_texts)
+            results[model_type] = {
+                **classification_metrics(y_test, y_pred),
+                "fit_seconds": round(fit_seconds, 4),
+                "predict_seconds": round(predict_seconds, 4)
+            }
+
+        report = {
+            "task_id": task_id,
+            "created_at": time.time(),
+            "datasets": request["dataset_filenames"],
+            "train_size": X_train_tfidf.shape[0],
+            "test_size": X_test_tfidf.shape[0],
+            "n_features": len(vectorizer.vocabulary_),
+            "vectorize_seconds": round(vectorize_seconds, 4),
+            "feature_cache_hit": features.cached,
+            "total_seconds": round(time.time() - start, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "best_model": max(results, key=lambda model_type: results[model_type]["f1_score"]),
+            "models": results
+        }
+        tmp_path = COMPARISON_REPORT_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, COMPARISON_REPORT_PATH)
+
+        job_store.update(task_id, status="Completed", epoch=len(model_types), progress=1.0, eta_seconds=0.0, metrics=report)
+    except JobCancelled:
+        job_store.update(task_id, status="Cancelled", eta_seconds=None)
+    except Exception as e:
+        job_store.update(task_id, status="Failed", error=str(e), eta_seconds=None)
+
+def load_comparison_report():
+    if not os.path.exists(COMPARISON_REPORT_PATH):
+        return None
+    with open(COMPARISON_REPORT_PATH) as f:
+        return json.load(f)
+
+def latest_training_results(limit: int = 500):
+    """
+    Metrics of the latest completed run per model type, from single-model
+    jobs and comparison runs alike. Returns {model_type: (job, metrics)}.
+    """
+    latest = {}
+    for job in job_store.list(limit):
+        if job["status"] != "Completed" or not job["metrics"]:
+            continue
+        if job["model_type"] == "COMPARISON":
+            for model_type, metrics in job["metrics"]["models"].items():
+                latest.setdefault(model_type, (job, metrics))
+        else:
+            latest.setdefault(job["model_type"], (job, job["metrics"]))
+    return latest
@@ -1,45 +1,237 @@
-import tweepy
+import asyncio
+import time
+from contextlib import aclosing
+from datetime import datetime
+import httpx
 from app.config import settings
 
-def get_twitter_client():
+class RateLimitExceeded(Exception):
+    pass
+
+class TokenBucket:
     """
-    Returns an authenticated Tweepy client using Bearer Token (v2 API).
+    Request budget shared by every caller of one endpoint.
+
+    Until the API has answered, tokens refill continuously from the documented
+    quota. Once x-rate-limit-* headers are seen, the bucket follows the API's
+    fixed window instead: it never holds more than the reported remaining
+    requests and refills completely at the reported reset time.
     """
-    if not settings.TWITTER_BEARER_TOKEN:
-        # Fallback or raise error if critical
-        print("Warning: TWITTER_BEARER_TOKEN is not set.")
-        return None
+    def __init__(self, capacity: int, window_seconds: float):
+        self.capacity = capacity
+        self.window = window_seconds
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.reset_at = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.reset_at:
+            if now >= self.reset_at:
+                self.tokens = float(self.capacity)
+                self.reset_at = 0.0
+        else:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / self.window)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        if self.reset_at:
+            return self.reset_at - time.monotonic()
+        return (1 - self.tokens) * self.window / self.capacity
+
+    async def acquire(self, max_wait: float):
+        # Only used from the event loop: nothing can run between check and take
+        while True:
+            wait = self.wait_time()
+            if wait == 0:
+                self.tokens -= 1
+                return
+            if wait > max_wait:
+                raise RateLimitExceeded(f"Twitter rate limit reached, retry in {int(wait)}s")
+            await asyncio.sleep(wait)
+
+    def update(self, headers, status_code: int = 200):
+        limit = headers.get("x-rate-limit-limit")
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
 
-    client = tweepy.Client(bearer_token=settings.TWITTER_BEARER_TOKEN)
-    return client
+        self._refill()
+        if limit:
+            self.capacity = int(limit)
+        if remaining is not None:
+            # Requests still in flight have already taken their tokens locally
+            self.tokens = min(self.tokens, float(remaining))
+        if status_code == 429:
+            self.tokens = 0.0
+        if reset:
+            # x-rate-limit-reset is a unix timestamp in whole seconds; allow for clock skew
+            self.reset_at = time.monotonic() + max(0.0, int(reset) - time.time()) + 1.0
 
-def fetch_tweets(keyword: str, max_results: int = 100):
+def _parse_search_response(payload):
+    users = {u["id"]: u for u in payload.get("includes", {}).get("users", [])}
+    tweets = []
+    for tweet in payload.get("data", []):
+        user = users.get(tweet.get("author_id"), {})
+        created_at = tweet.get("created_at")
+        tweets.append({
+            "id": tweet["id"],
+            "text": tweet["text"],
+            "created_at": datetime.fromisoformat(created_at.replace("Z", "+00:00")) if created_at else None,
+            "user_id": tweet.get("author_id", "Unknown"),
+            "username": f"@{user['username']}" if "username" in user else "Unknown",
+            "country": user.get("location") or "Unknown"
+        })
+    return tweets, payload.get("meta", {})
+
+class _SharedSearch:
     """
-    Fetches tweets containing the keyword.
-    Enforces a hard stop / limit to avoid rate limits (handled by max_results).
+    One paginated upstream search, shared by all concurrent identical requests.
+    Pages are fetched one ahead of the fastest reader, so the next page is in
+    flight while the current one is being scored.
     """
-    client = get_twitter_client()
-    if not client:
-        return []
+    def __init__(self, client, key):
+        self.client = client
+        self.key = key
+        self.pages = []
+        self.consumed = 0
+        self.readers = 0
+        self.done = False
+        self.error = None
+        self.changed = asyncio.Condition()
+        self.task = asyncio.get_running_loop().create_task(self._produce())
+
+    async def _produce(self):
+        query, limit, since_id = self.key
+        remaining = limit
+        next_token = None
+        try:
+            while remaining > 0:
+                async with self.changed:
+                    await self.changed.wait_for(lambda: len(self.pages) <= self.consumed)
+                # The v2 API only accepts page sizes between 10 and 100
+                tweets, meta = await self.client.search_page(query, min(100, max(10, remaining)), next_token, since_id)
+                tweets = tweets[:remaining]
+                async with self.changed:
+                    if tweets:
+                        self.pages.append(tweets)
+                    self.changed.notify_all()
+                remaining -= len(tweets)
+                next_token = meta.get("next_token")
+                if not tweets or not next_token:
+                    break
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            if self.client._searches.get(self.key) is self:
+                del self.client._searches[self.key]
+            async with self.changed:
+                self.changed.notify_all()
+
+    async def read(self):
+        self.readers += 1
+        index = 0
+        try:
+            while True:
+                async with self.changed:
+                    await self.changed.wait_for(lambda: index < len(self.pages) or self.done)
+                    if index >= len(self.pages):
+                        if self.error:
+                            raise self.error
+                        return
+                    page = self.pages[index]
+                    index += 1
+                    self.consumed = max(self.consumed, index)
+                    self.changed.notify_all()
+                yield page
+        finally:
+            self.readers -= 1
+            if self.readers == 0 and not self.done:
+                # Every reader went away: stop fetching further pages
+                self.task.cancel()
+                if self.client._searches.get(self.key) is self:
+                    del self.client._searches[self.key]
+
+class AsyncTwitterClient:
+    """
+    Async v2 recent-search client with one pooled HTTP session, page prefetch,
+    a shared rate-limit budget and coalescing of identical concurrent queries.
+    """
+    SEARCH_PATH = "/2/tweets/search/recent"
+
+    def __init__(self, base_url: str = None, bearer_token: str = None):
+        self.base_url = base_url or settings.TWITTER_API_BASE_URL
+        self.bearer_token = settings.TWITTER_BEARER_TOKEN if bearer_token is None else bearer_token
+        self.limiter = TokenBucket(settings.TWITTER_SEARCH_RATE_LIMIT, settings.TWITTER_RATE_WINDOW_SECONDS)
+        self._http = None
+        self._searches = {}
+
+    def _session(self):
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.bearer_token}"},
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+            )
+        return self._http
+
+    async def search_page(self, query: str, max_results: int = 100, next_token: str = None, since_id: str = None):
+        """
+        Fetches one page of search results. Returns (tweets, meta).
+        """
+        params = {
+            "query": query,
+            "max_results": max_results,
+            "tweet.fields": "created_at,lang,author_id",
+            "expansions": "author_id",
+            "user.fields": "username,location"
+        }
+        if next_token:
+            params["next_token"] = next_token
+        if since_id:
+            params["since_id"] = since_id
+
+        for attempt in range(2):
+            await self.limiter.acquire(settings.TWITTER_MAX_RATE_WAIT_SECONDS)
+            response = await self._session().get(self.SEARCH_PATH, params=params)
+            self.limiter.update(response.headers, response.status_code)
+            if response.status_code == 429:
+                if attempt == 0:
+                    # The limiter now waits for the reset time before retrying
+                    continue
+                raise RateLimitExceeded("Twitter rate limit reached")
+            response.raise_for_status()
+            return _parse_search_response(response.json())
+
+    async def pages(self, keyword: str, max_results: int = 100, since_id: str = None):
+        """
+        Async generator of tweet pages for keyword. Use with contextlib.aclosing
+        so that leaving early stops the upstream fetch.
+        """
+        if not self.bearer_token:
+            print("Warning: TWITTER_BEARER_TOKEN is not set.")
+            return
 
-    query = f"{keyword} -is:retweet lang:en"
-    
-    try:
         # Safety cap
-        limit = min(max_results, 500) 
-        
-        tweets_data = []
-        for response in tweepy.Paginator(client.search_recent_tweets, 
-                                         query=query, 
-                                         tweet_fields=['created_at', 'lang'], 
-                                         max_results=100).flatten(limit=limit):
-            tweets_data.append({
-                "id": response.id,
-                "text": response.text,
-                "created_at": response.created_at
-            })
-            
-        return tweets_data
-    except Exception as e:
-        print(f"Error fetching tweets: {e}")
-        return []
+        key = (f"{keyword} -is:retweet lang:en", min(max_results, 500), since_id)
+        search = self._searches.get(key)
+        if search is None:
+            search = self._searches[key] = _SharedSearch(self, key)
+
+        async with aclosing(search.read()) as pages:
+            async for page in pages:
+                yield page
+
+    async def fetch(self, keyword: str, max_results: int = 100, since_id: str = None):
+        return [tweet async for page in self.pages(keyword, max_results, since_id) for tweet in page]
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+twitter_client = AsyncTwitterClient()
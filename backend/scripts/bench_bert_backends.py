@@ -0,0 +1,54 @@
+"""
+Benchmark for BERT inference backends on CPU. Run from the backend directory
+after a BERT model has been trained and saved:
+
+    python -m scripts.bench_bert_backends --texts 512 --batch-size 16
+
+Serves the saved model with the eager torch backend and the exported ONNX
+graph (exported first if missing or stale), and reports throughput and
+per-request p50/p99 latency for each, plus the largest probability difference.
+"""
+import argparse
+import random
+import time
+import numpy as np
+from app.model.bert_model import BertModelWrapper
+
+WORDS = ["great", "awful", "model", "launch", "is", "so", "fast", "slow", "love", "hate",
+         "the", "new", "update", "really", "not", "good", "bad", "today", "again", "why"]
+
+def make_corpus(rows, seed=0):
+    # Tweet-like length mix: mostly short, some long
+    rnd = random.Random(seed)
+    return [" ".join(rnd.choice(WORDS) for _ in range(rnd.choice([4, 8, 12, 20, 40]))) for _ in range(rows)]
+
+def run(model, corpus, batch_size):
+    model.predict_proba(corpus[:batch_size])  # warm-up
+    latencies = []
+    probabilities = []
+    start = time.perf_counter()
+    for i in range(0, len(corpus), batch_size):
+        t0 = time.perf_counter()
+        probabilities.append(model.predict_proba(corpus[i:i + batch_size]))
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    return np.vstack(probabilities), len(corpus) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=16, help="Texts per request")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.texts)
+    results = {}
+    for backend in ("torch", "onnx"):
+        model = BertModelWrapper(pretrained=False, backend=backend)
+        model.load()
+        results[backend], throughput, p50, p99 = run(model, corpus, args.batch_size)
+        print(f"{backend:<8} {throughput:>10,.1f} texts/sec   p50 {p50 * 1000:>8.1f} ms   p99 {p99 * 1000:>8.1f} ms")
+
+    print(f"Max probability difference: {np.abs(results['torch'] - results['onnx']).max():.2e}")
+
+if __name__ == "__main__":
+    main()
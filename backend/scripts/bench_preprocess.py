@@ -0,0 +1,73 @@
+"""
+Benchmark for text preprocessing. Run from the backend directory:
+
+    python -m scripts.bench_preprocess --rows 200000
+
+Reports rows/sec for row-by-row clean_text and the batch clean_texts API
+(best of --repeat runs, timings on a shared machine are noisy) and checks
+that the batch output is identical; tests/test_preprocess.py covers the
+equivalence on randomized adversarial inputs.
+
+Measured on one CPU, 50k rows of the mixed-script corpus below, best of 5:
+clean_text 56-62k rows/sec, clean_texts 97-117k rows/sec, 1.55-2.1x over
+three runs. n_jobs only pays off with several CPUs and millions of rows.
+"""
+import argparse
+import os
+import random
+import time
+import pandas as pd
+from app.utils.preprocess import clean_text, clean_texts
+
+WORDS = ["great", "awful", "model", "AI", "is", "so", "fast", "slow", "😀", "İstanbul", "café", "٣٤", "2024"]
+EXTRAS = ["@user_1", "http://t.co/x1", "https://ex.com/a?b=1", "www.site.org", "#Tag", "!!!", "...", "\t", "\n"]
+
+def make_corpus(rows, seed=0):
+    rnd = random.Random(seed)
+    pool = WORDS + EXTRAS
+    return [" ".join(rnd.choice(pool) for _ in range(rnd.randint(3, 25))) for _ in range(rows)]
+
+def make_adversarial(rows, seed=1):
+    # Short strings built from fragments that interact between cleaning steps
+    rnd = random.Random(seed)
+    fragments = list("abhtpw@ .:/#!12\t\n") + ["http", "www", "@", "٣", "İ", "\x1c", "Ⅻ", "²", "HTTP", "WWW"]
+    return ["".join(rnd.choice(fragments) for _ in range(rnd.randint(0, 30))) for _ in range(rows)]
+
+def timed(label, fn, rows, repeat):
+    elapsed = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{label:<32} {rows / elapsed:>12,.0f} rows/sec")
+    return result, elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.rows)
+    series = pd.Series(corpus)
+
+    expected, row_seconds = timed("clean_text (row by row)", lambda: [clean_text(t) for t in corpus], args.rows, args.repeat)
+    as_list, batch_seconds = timed("clean_texts (list)", lambda: clean_texts(corpus), args.rows, args.repeat)
+    as_series, _ = timed("clean_texts (Series)", lambda: clean_texts(series), args.rows, args.repeat)
+    chunk_size = max(1, args.rows // args.jobs)
+    parallel, _ = timed(f"clean_texts (n_jobs={args.jobs})",
+                        lambda: clean_texts(corpus, n_jobs=args.jobs, chunk_size=chunk_size), args.rows, args.repeat)
+    print(f"clean_texts speedup: {row_seconds / batch_seconds:.2f}x")
+
+    assert as_list == expected
+    assert as_series.tolist() == expected
+    assert parallel == expected
+
+    adversarial = make_adversarial(100000) + [None, float("nan"), 42]
+    assert clean_texts(adversarial) == [clean_text(t) for t in adversarial]
+    assert clean_texts(pd.Series(adversarial)).tolist() == [clean_text(t) for t in adversarial]
+    print("Batch output identical to clean_text")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark for the SVM solvers. Run from the backend directory:
+
+    python -m scripts.bench_svm --rows 20000
+    python -m scripts.bench_svm --csv data/trained/tweets.csv --chunk-rows 50000
+
+Trains SVMModel with each solver on the same split and reports fit time,
+predict_proba throughput and weighted F1. "streaming" is the pipeline
+streaming SVM training jobs build (app.utils.training.fit_streaming:
+hashed TF-IDF, calibrated hinge-loss SGD), fed the training split in chunks. The kernel SVC is
+skipped above --svc-max-rows rows because it does not finish in reasonable
+time on large corpora.
+"""
+import argparse
+import random
+import time
+import pandas as pd
+from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
+from app.model.svm_model import SVMModel
+from app.utils.training import fit_streaming
+from app.utils.preprocess import clean_texts
+
+POSITIVE = ["love", "great", "amazing", "happy", "best", "awesome", "good", "win"]
+NEGATIVE = ["hate", "awful", "terrible", "sad", "worst", "broken", "bad", "fail"]
+NEUTRAL = ["the", "phone", "update", "today", "new", "app", "team", "game", "is", "so", "this", "my"]
+
+def make_corpus(rows, seed=0):
+    # Noisy synthetic tweets: label words are outnumbered by neutral ones
+    rnd = random.Random(seed)
+    texts, labels = [], []
+    for _ in range(rows):
+        label = rnd.randint(0, 1)
+        words = [rnd.choice(NEUTRAL) for _ in range(rnd.randint(5, 20))]
+        for _ in range(rnd.randint(1, 3)):
+            own, other = (POSITIVE, NEGATIVE) if label else (NEGATIVE, POSITIVE)
+            words.insert(rnd.randrange(len(words) + 1), rnd.choice(own if rnd.random() < 0.8 else other))
+        texts.append(" ".join(words))
+        labels.append(label)
+    return texts, labels
+
+def load_csv(path):
+    df = pd.read_csv(path, usecols=["text", "label"]).dropna()
+    return clean_texts(df["text"].tolist()), df["label"].astype(int).tolist()
+
+def chunked(texts, labels, size):
+    for start in range(0, len(texts), size):
+        yield texts[start:start + size], labels[start:start + size]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000, help="Synthetic rows when no --csv is given")
+    parser.add_argument("--csv", help="CSV with text and label columns")
+    parser.add_argument("--chunk-rows", type=int, default=10000)
+    parser.add_argument("--svc-max-rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    texts, labels = load_csv(args.csv) if args.csv else make_corpus(args.rows)
+    X_train, X_test, y_train, y_test = train_test_split(texts, labels, test_size=0.2, random_state=42)
+
+    runs = ["svc", "linear", "sgd", "streaming"]
+    if len(X_train) > args.svc_max_rows:
+        print(f"Skipping svc: {len(X_train):,} training rows > --svc-max-rows")
+        runs.remove("svc")
+
+    print(f"{'solver':<12} {'fit (s)':>10} {'predict (texts/s)':>18} {'F1':>8}")
+    for run in runs:
+        model = SVMModel(solver="sgd" if run == "streaming" else run)
+        start = time.perf_counter()
+        if run == "streaming":
+            model.model = fit_streaming(
+                "SVM", chunked(X_train, y_train, args.chunk_rows), chunked(X_train, y_train, args.chunk_rows)
+            )
+        else:
+            model.train(X_train, y_train)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        proba = model.predict_proba(X_test)
+        throughput = len(X_test) / (time.perf_counter() - start)
+        f1 = f1_score(y_test, proba.argmax(axis=1), average="weighted")
+        print(f"{run:<12} {fit_seconds:>10.2f} {throughput:>18,.0f} {f1:>8.4f}")
+
+if __name__ == "__main__":
+    main()
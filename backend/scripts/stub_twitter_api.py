@@ -0,0 +1,107 @@
+"""
+Local stand-in for the Twitter v2 recent search endpoint, for developing and
+load testing the ingestion client without real credentials or quota.
+
+    uvicorn scripts.stub_twitter_api:app --port 8081
+
+Then start the backend with TWITTER_API_BASE_URL=http://localhost:8081 and any
+TWITTER_BEARER_TOKEN. Responses carry x-rate-limit-* headers and return 429
+once the quota for the current window is used up.
+
+Tweets behave like a live timeline: STUB_TOTAL_TWEETS are searchable at
+startup and new ones arrive at STUB_TWEETS_PER_SECOND with increasing ids.
+Pages are newest first and honour since_id and next_token, so polling with
+since_id only returns tweets that arrived since the last poll.
+"""
+import math
+import os
+import random
+import time
+from datetime import datetime, timezone
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+RATE_LIMIT = int(os.getenv("STUB_RATE_LIMIT", "450"))
+WINDOW_SECONDS = int(os.getenv("STUB_WINDOW_SECONDS", "900"))
+TOTAL_TWEETS = int(os.getenv("STUB_TOTAL_TWEETS", "1000"))  # Searchable tweets, like the real 7-day window
+TWEETS_PER_SECOND = float(os.getenv("STUB_TWEETS_PER_SECOND", "20"))
+LATENCY_SECONDS = float(os.getenv("STUB_LATENCY_SECONDS", "0.05"))
+
+app = FastAPI(title="Twitter API stub")
+
+FIRST_ID = 10**18
+started = time.time()
+window_start = started
+calls = 0
+
+WORDS = ["great", "awful", "love", "hate", "fast", "slow", "model", "today", "really", "not"]
+
+def _rate_headers(remaining):
+    return {
+        "x-rate-limit-limit": str(RATE_LIMIT),
+        "x-rate-limit-remaining": str(max(0, remaining)),
+        "x-rate-limit-reset": str(math.ceil(window_start + WINDOW_SECONDS))
+    }
+
+def _newest_id():
+    # TOTAL_TWEETS exist at startup, then new ones arrive at TWEETS_PER_SECOND; ids grow with time
+    return FIRST_ID + TOTAL_TWEETS - 1 + int((time.time() - started) * TWEETS_PER_SECOND)
+
+def _tweet(tweet_id, keyword):
+    # Derived from the id alone, so a tweet looks the same in every response
+    rnd = random.Random(tweet_id)
+    author_id = str(rnd.randint(1, 50))
+    created_at = started + (tweet_id - FIRST_ID - TOTAL_TWEETS + 1) / TWEETS_PER_SECOND
+    tweet = {
+        "id": str(tweet_id),
+        "text": f"{keyword} is {' '.join(rnd.choices(WORDS, k=5))}",
+        "created_at": datetime.fromtimestamp(created_at, timezone.utc).isoformat().replace("+00:00", "Z"),
+        "author_id": author_id,
+        "lang": "en"
+    }
+    user = {"id": author_id, "username": f"user{author_id}", "location": rnd.choice(["USA", "UK", "India"])}
+    return tweet, user
+
+@app.get("/2/tweets/search/recent")
+def search_recent(
+    query: str,
+    max_results: int = Query(10, ge=10, le=100),
+    next_token: str = None,
+    since_id: str = None
+):
+    """
+    Newest first, like the real endpoint: a page holds the newest tweets
+    not older than since_id (exclusive), and next_token continues with the
+    older ones.
+    """
+    global window_start, calls
+    if time.time() > window_start + WINDOW_SECONDS:
+        window_start, calls = time.time(), 0
+    calls += 1
+    if calls > RATE_LIMIT:
+        return JSONResponse(status_code=429, content={"title": "Too Many Requests"}, headers=_rate_headers(0))
+
+    time.sleep(LATENCY_SECONDS)
+    keyword = query.split()[0]
+    newest = _newest_id()
+    # Exclusive lower bound: since_id, or the oldest tweet still searchable
+    lowest = max(int(since_id) if since_id else 0, newest - TOTAL_TWEETS)
+    highest = int(next_token) if next_token else newest
+    page_ids = range(highest, max(lowest, highest - max_results), -1)
+
+    data, users = [], {}
+    for tweet_id in page_ids:
+        tweet, user = _tweet(tweet_id, keyword)
+        data.append(tweet)
+        users[user["id"]] = user
+
+    meta = {"result_count": len(data)}
+    if data:
+        meta["newest_id"], meta["oldest_id"] = data[0]["id"], data[-1]["id"]
+        if page_ids[-1] - 1 > lowest:
+            meta["next_token"] = str(page_ids[-1] - 1)
+
+    return JSONResponse(
+        content={"data": data, "includes": {"users": list(users.values())}, "meta": meta},
+        headers=_rate_headers(RATE_LIMIT - calls)
+    )
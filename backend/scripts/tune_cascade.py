@@ -0,0 +1,135 @@
+"""
+Picks the confidence threshold of the CASCADE model type. Run from the
+backend directory once both stages are trained on the same datasets:
+
+    python -m scripts.tune_cascade --datasets tweets.csv
+    python -m scripts.tune_cascade --datasets tweets.csv --fast LR --slow LSTM --target-f1 0.85
+
+Both saved models score the held-out split of the training job (same
+datasets and split ratio) once. For every candidate threshold the cascade
+keeps the fast prediction where its margin P(top) - P(other) reaches the
+threshold and takes the slow one elsewhere; the cheapest threshold, i.e.
+the one sending the fewest texts to the slow model, whose weighted F1
+reaches --target-f1 is written to saved_models/cascade.json, which the
+running API picks up on its next batch. The default target is the slow
+model's own F1 minus --tolerance.
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from sklearn.metrics import f1_score
+from app.model.registry import artifact_version, build_model, class_labels
+from app.utils.cascade import CASCADE_CONFIG_PATH
+from app.utils.training import load_training_data, split_data
+
+def score(model_type, texts):
+    """
+    Labels, top-class confidence and seconds per text of a saved model.
+    """
+    model = build_model(model_type)
+    model.load()
+    start = time.perf_counter()
+    proba = np.asarray(model.predict_proba(texts))
+    seconds = (time.perf_counter() - start) / len(texts)
+    labels = np.array([{"Negative": 0, "Positive": 1}[name] for name in class_labels(model)])
+    return labels[proba.argmax(axis=1)], proba.max(axis=1), seconds, artifact_version(model.model_path)
+
+def weighted_f1(confusion):
+    """
+    Weighted F1 of stacked 2x2 confusion matrices [..., true, predicted].
+    """
+    tp = np.diagonal(confusion, axis1=-2, axis2=-1)
+    support, predicted = confusion.sum(axis=-1), confusion.sum(axis=-2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        f1 = np.nan_to_num(2 * tp / (support + predicted))
+    return (f1 * support).sum(axis=-1) / support.sum(axis=-1)
+
+def sweep(y_test, fast_labels, fast_margin, slow_labels):
+    """
+    (threshold, weighted F1, slow fraction) for every distinct cut of the
+    fast margins, from no text to the slow model up to all of them.
+
+    Texts are sorted by margin, so the cut sending the k least confident to
+    the slow model has confusion counts slow[:k] + fast[k:], computed for
+    every k at once with cumulative sums.
+    """
+    order = np.argsort(fast_margin, kind="stable")
+    y, fast, slow, margins = y_test[order], fast_labels[order], slow_labels[order], fast_margin[order]
+    cells = lambda predictions: np.stack([
+        np.concatenate([[0], np.cumsum((y == t) & (predictions == p))]) for t in (0, 1) for p in (0, 1)
+    ], axis=-1).reshape(-1, 2, 2)
+    from_slow, from_fast = cells(slow), cells(fast)
+    confusion = from_slow + (from_fast[-1] - from_fast)
+    f1 = weighted_f1(confusion)
+
+    # Only cuts between distinct margins are reachable by a threshold
+    n = len(margins)
+    cuts = np.append(np.flatnonzero(np.diff(margins)) + 1, n)
+    thresholds = np.append(margins[cuts[:-1]], np.inf)
+    rows = [(float(margins[0]) if n else 0.0, float(f1[0]), 0.0)]
+    rows += [(float(t), float(f1[k]), k / n) for t, k in zip(thresholds, cuts)]
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--datasets", nargs="+", required=True, help="Dataset filenames the models were trained on")
+    parser.add_argument("--split-ratio", type=float, default=0.8)
+    parser.add_argument("--fast", default="LR")
+    parser.add_argument("--slow", default="BERT")
+    parser.add_argument("--target-f1", type=float, help="Default: the slow model's F1 minus --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.005)
+    parser.add_argument("--max-rows", type=int, default=20000, help="Held-out rows to score (BERT is slow on CPU)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the sweep without writing cascade.json")
+    args = parser.parse_args()
+
+    _, X_test, _, y_test = split_data(load_training_data(args.datasets), args.split_ratio)
+    X_test, y_test = X_test[:args.max_rows], np.asarray(y_test[:args.max_rows])
+    print(f"Scoring {len(X_test):,} held-out texts with {args.fast} and {args.slow}")
+
+    fast_labels, fast_confidence, fast_seconds, fast_version = score(args.fast, X_test)
+    slow_labels, _, slow_seconds, slow_version = score(args.slow, X_test)
+    fast_margin = 2 * fast_confidence - 1
+    slow_f1 = float(f1_score(y_test, slow_labels, average="weighted"))
+    target = args.target_f1 if args.target_f1 is not None else slow_f1 - args.tolerance
+
+    rows = sweep(y_test, fast_labels, fast_margin, slow_labels)
+    # Lowest slow fraction meeting the target; the best F1 if none does
+    meeting = [row for row in rows if row[1] >= target]
+    threshold, f1, slow_fraction = min(meeting, key=lambda row: (row[2], -row[1])) if meeting else max(rows, key=lambda row: row[1])
+    cost_ms = (fast_seconds + slow_fraction * slow_seconds) * 1000
+
+    print(f"{'slow share':>10} {'threshold':>10} {'F1':>8} {'ms/text':>8}")
+    shown = {min(rows, key=lambda row: abs(row[2] - share)) for share in (0.0, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0)}
+    for row in sorted(shown, key=lambda row: row[2]):
+        print(f"{row[2]:>10.1%} {row[0]:>10.4f} {row[1]:>8.4f} {(fast_seconds + row[2] * slow_seconds) * 1000:>8.3f}")
+    print(f"{args.fast} alone: F1 {rows[0][1]:.4f}, {fast_seconds * 1000:.3f} ms/text")
+    print(f"{args.slow} alone: F1 {slow_f1:.4f}, {slow_seconds * 1000:.3f} ms/text")
+    if not meeting:
+        print(f"No threshold reaches F1 {target:.4f}, using the best one")
+    print(f"Chosen: threshold {threshold:.4f}, F1 {f1:.4f}, {slow_fraction:.1%} to {args.slow}, {cost_ms:.3f} ms/text")
+
+    if args.dry_run:
+        return
+    config = {
+        "fast_model": args.fast,
+        "slow_model": args.slow,
+        # Infinity is not JSON; a margin is at most 1, so this sends everything to the slow model
+        "threshold": min(threshold, 1.0 + 1e-9),
+        "target_f1": round(target, 4),
+        "expected_f1": round(f1, 4),
+        "slow_fraction": round(slow_fraction, 4),
+        "expected_ms_per_text": round(cost_ms, 4),
+        "fast_model_version": fast_version,
+        "slow_model_version": slow_version,
+        "datasets": args.datasets,
+        "tuned_at": time.time()
+    }
+    with open(CASCADE_CONFIG_PATH + ".tmp", "w") as f:
+        json.dump(config, f, indent=2)
+    os.replace(CASCADE_CONFIG_PATH + ".tmp", CASCADE_CONFIG_PATH)
+    print(f"Wrote {CASCADE_CONFIG_PATH}")
+
+if __name__ == "__main__":
+    main()
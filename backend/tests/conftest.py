@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Tests import app from the backend directory, whatever the working directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# app.config creates its data directories relative to the working directory
+os.chdir(tempfile.mkdtemp(prefix="sentiment-tests-"))
@@ -0,0 +1,50 @@
+"""
+clean_texts must give exactly clean_text's output. Run from the backend directory:
+
+    python -m pytest tests
+"""
+import random
+import pandas as pd
+import pytest
+from app.utils.preprocess import clean_text, clean_texts, SEPARATOR
+
+# Fragments whose cleaning steps interact: URL and mention starts next to each
+# other, punctuation and digits inside them, case changes that grow the
+# string, non-ASCII digits and letters, and the separator's neighbours
+FRAGMENTS = [
+    "http", "https://", "www", "HTTP", "WWW", "Www.", "http://t.co/x1", "www.site.org/a?b=1",
+    "@", "@user_1", "@http", "@www", "@bob", "_", "#Tag", "!", ".", ":", "/", "?", "&amp;",
+    "a", "b", "h", "t", "p", "w", "x", "1", "2024", "٣٤", "²", "Ⅻ",
+    "İ", "ΟΔΟΣ", "Σ", "ß", "ﬁ", "K", "é", "café", "😀", "日本",
+    " ", "  ", "\t", "\n", "\r", "\x1c", "\x85", " ", " ", "　", "\x01",
+]
+
+def random_texts(seed, rows=2000, max_fragments=12):
+    rnd = random.Random(seed)
+    return ["".join(rnd.choice(FRAGMENTS) for _ in range(rnd.randint(0, max_fragments))) for _ in range(rows)]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_clean_texts_matches_clean_text(seed):
+    texts = random_texts(seed)
+    assert clean_texts(texts) == [clean_text(t) for t in texts]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_small_chunks_match(seed):
+    texts = random_texts(seed, rows=500)
+    assert clean_texts(texts, chunk_size=7) == [clean_text(t) for t in texts]
+
+def test_edge_cases():
+    texts = [
+        "", " ", "\n\t", None, float("nan"), 42,
+        "@userhttp://t.co/x done", "@user_www.site.org", "@http://x", "hi@bob!", "!@bob",
+        "Visit https://Example.com/ÄÖ now", "ΟΔΟΣ", "ΟΔΟΣ ΟΔΟΣ", "Σ", "AΣ", "I LOVE İSTANBUL 2024 ٣٤",
+        "ends with space ", " starts with space", "a" + SEPARATOR + "b", SEPARATOR,
+    ]
+    assert clean_texts(texts) == [clean_text(t) for t in texts]
+    assert clean_texts([]) == []
+
+def test_series_keeps_index():
+    series = pd.Series(["Great @bob http://x.y", "AWFUL!!! 123", None], index=[10, 5, 7])
+    cleaned = clean_texts(series)
+    assert cleaned.index.tolist() == [10, 5, 7]
+    assert cleaned.tolist() == [clean_text(t) for t in series]
@@ -0,0 +1,70 @@
+"""
+KeywordTracker.poll against a fake paginated client. Run from the backend directory:
+
+    python -m pytest tests
+"""
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.utils import tracker as tracker_module
+from app.utils.tracker import KeywordTracker, TrackedKeyword
+
+class FakeClient:
+    """
+    Serves tweet ids newest first, page_size per page, and fails on the
+    page numbers listed in fail_on (once each).
+    """
+    def __init__(self, ids, page_size, fail_on=()):
+        self.ids = sorted(ids, reverse=True)
+        self.page_size = page_size
+        self.fail_on = set(fail_on)
+
+    async def pages(self, keyword, limit, since_id=None):
+        ids = [i for i in self.ids if since_id is None or i > int(since_id)][:limit]
+        for number, start in enumerate(range(0, len(ids), self.page_size), 1):
+            if number in self.fail_on:
+                self.fail_on.discard(number)
+                raise RuntimeError("429 Too Many Requests")
+            yield [{"id": str(i), "text": f"tweet {i}"} for i in ids[start:start + self.page_size]]
+
+async def fake_score(model_type, tweets, keyword=None):
+    return [SimpleNamespace(text=t["id"], sentiment="Positive", confidence=0.9) for t in tweets]
+
+@pytest.fixture
+def tracked(monkeypatch):
+    monkeypatch.setattr(tracker_module, "score_tweets", fake_score)
+    return TrackedKeyword("phone", "LR", capacity=100)
+
+def buffered(tracked):
+    return [result.text for result in tracked.results]
+
+def test_multi_page_poll_keeps_arrival_order(monkeypatch, tracked):
+    monkeypatch.setattr(tracker_module, "twitter_client", FakeClient(range(1, 8), page_size=2))
+    asyncio.run(KeywordTracker(max_per_poll=100).poll(tracked))
+    assert buffered(tracked) == ["1", "2", "3", "4", "5", "6", "7"]
+    assert tracked.since_id == "7"
+
+def test_failed_page_records_nothing_and_is_retried(monkeypatch, tracked):
+    client = FakeClient(range(1, 5), page_size=2, fail_on=[2])
+    monkeypatch.setattr(tracker_module, "twitter_client", client)
+    tracker = KeywordTracker(max_per_poll=100)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(tracker.poll(tracked))
+    assert buffered(tracked) == []
+    assert tracked.since_id is None and tracked.total_scored == 0
+
+    asyncio.run(tracker.poll(tracked))
+    assert buffered(tracked) == ["1", "2", "3", "4"]
+    assert tracked.since_id == "4" and tracked.total_scored == 4
+
+def test_next_poll_only_adds_newer_tweets(monkeypatch, tracked):
+    client = FakeClient(range(1, 4), page_size=2)
+    monkeypatch.setattr(tracker_module, "twitter_client", client)
+    tracker = KeywordTracker(max_per_poll=100)
+    asyncio.run(tracker.poll(tracked))
+    client.ids = sorted(range(1, 7), reverse=True)
+    asyncio.run(tracker.poll(tracked))
+    asyncio.run(tracker.poll(tracked))
+    assert buffered(tracked) == ["1", "2", "3", "4", "5", "6"]
+    assert tracked.total_scored == 6